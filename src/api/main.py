@@ -1,13 +1,21 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Header, Query, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
 import tempfile
 import os
+import hashlib
+import shutil
+from datetime import datetime
 from pathlib import Path
+import soundfile as sf
 
 from ..pipeline.conversion_pipeline import VoiceConversionPipeline
+from ..pipeline.job_worker import WorkerPool
+from ..pipeline.chunk_planner import MODE_OFFLINE, MODE_STREAMING
 from ..storage.voice_library import VoiceLibrary
+from ..storage.job_queue import JobQueue, JOB_COMPLETED
 from ..core.config import Config
-from .models import ConversionRequest, ConversionResponse
+from .models import ConversionRequest, ConversionResponse, JobResponse, VoiceListResponse
 
 app = FastAPI(title="Voice Conversion System", version="1.0.0")
 
@@ -15,12 +23,25 @@ app = FastAPI(title="Voice Conversion System", version="1.0.0")
 config = Config()
 pipeline = VoiceConversionPipeline()
 voice_library = VoiceLibrary(config)
+job_queue = JobQueue(config)
+job_workers = WorkerPool(config.config_path)
+
+@app.on_event("startup")
+async def start_job_workers():
+    """Start background conversion workers"""
+    job_workers.start()
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    """Stop background conversion workers"""
+    job_workers.stop()
 
 @app.post("/convert", response_model=ConversionResponse)
 async def convert_voice(
     source_audio: UploadFile = File(...),
     target_voice_id: str = None,
-    target_audio: UploadFile = File(None)
+    target_audio: UploadFile = File(None),
+    mode: str = Query(MODE_OFFLINE, regex=f"^({MODE_OFFLINE}|{MODE_STREAMING})$")
 ):
     """Convert voice using either library voice or uploaded target"""
     
@@ -38,17 +59,20 @@ async def convert_voice(
             # Save uploaded target audio temporarily
             with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_target:
                 temp_target.write(await target_audio.read())
-                                target_path = temp_target.name
+                target_path = temp_target.name
         
         # Generate output path
         output_path = tempfile.mktemp(suffix=".wav")
         
-        # Perform conversion
-        result = pipeline.convert_voice(
+        # Perform conversion off the event loop so concurrent identical
+        # requests can be coalesced by the pipeline
+        result = await run_in_threadpool(
+            pipeline.convert_voice,
             source_audio_path=source_path,
             target_voice_id=target_voice_id,
             target_audio_path=target_path,
-            output_path=output_path
+            output_path=output_path,
+            mode=mode
         )
         
         if not result['success']:
@@ -58,7 +82,9 @@ async def convert_voice(
             success=True,
             output_path=output_path,
             duration=result['duration'],
-            chunks_processed=result['chunks_processed']
+            chunks_processed=result['chunks_processed'],
+            chunk_plan=result['chunk_plan'],
+            cache_hit=result['cache_hit']
         )
     
     finally:
@@ -68,6 +94,92 @@ async def convert_voice(
         if target_path and os.path.exists(target_path):
             os.unlink(target_path)
 
+def _job_response(job: dict) -> JobResponse:
+    return JobResponse(
+        job_id=job['id'],
+        status=job['status'],
+        chunks_done=job['chunks_done'],
+        chunks_total=job['chunks_total'],
+        progress=(
+            1.0 if job['status'] == JOB_COMPLETED
+            else job['chunks_done'] / job['chunks_total'] if job['chunks_total'] else 0.0
+        ),
+        attempts=job['attempts'],
+        duration=job['duration'],
+        error=job['error']
+    )
+
+@app.post("/jobs", response_model=JobResponse)
+async def submit_job(
+    source_audio: UploadFile = File(...),
+    target_voice_id: str = None,
+    target_audio: UploadFile = File(None)
+):
+    """Queue a conversion job and return immediately"""
+    
+    if not target_voice_id and not target_audio:
+        raise HTTPException(400, "Either target_voice_id or target_audio must be provided")
+    
+    # An unknown voice can never succeed; reject it instead of retrying it max_attempts times
+    if target_voice_id:
+        try:
+            voice_library.get_voice_embedding(target_voice_id)
+        except ValueError:
+            raise HTTPException(404, f"Voice {target_voice_id} not found")
+    
+    job_id = job_queue.new_job_id()
+    job_dir = job_queue.job_dir(job_id)
+    
+    # Stream uploads to disk; job sources can be hours of audio
+    source_path = str(job_dir / "source.wav")
+    with open(source_path, 'wb') as f:
+        await run_in_threadpool(shutil.copyfileobj, source_audio.file, f)
+    
+    try:
+        source_duration = sf.info(source_path).duration
+    except Exception as e:
+        job_queue.remove_job_dir(job_id)
+        raise HTTPException(400, f"Unreadable source audio: {e}")
+    
+    max_duration = config.system.processing.max_job_audio_length
+    if source_duration > max_duration:
+        job_queue.remove_job_dir(job_id)
+        raise HTTPException(413, f"Audio too long: {source_duration:.1f}s > {max_duration}s")
+    
+    target_path = None
+    if target_audio:
+        target_path = str(job_dir / "target.wav")
+        with open(target_path, 'wb') as f:
+            await run_in_threadpool(shutil.copyfileobj, target_audio.file, f)
+    
+    job = job_queue.enqueue(job_id, source_path, target_voice_id, target_path)
+    return _job_response(job)
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """Get status and progress of a conversion job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(404, "Job not found")
+    
+    return _job_response(job)
+
+@app.get("/jobs/{job_id}/result")
+async def download_job_result(job_id: str):
+    """Download the output of a completed conversion job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(404, "Job not found")
+    
+    if job['status'] != JOB_COMPLETED:
+        raise HTTPException(409, f"Job is {job['status']}")
+    
+    return FileResponse(
+        job['output_path'],
+        media_type="audio/wav",
+        filename=f"{job_id}.wav"
+    )
+
 @app.get("/download/{file_path}")
 async def download_converted_audio(file_path: str):
     """Download converted audio file"""
@@ -80,10 +192,42 @@ async def download_converted_audio(file_path: str):
         filename="converted_audio.wav"
     )
 
-@app.get("/voices")
-async def list_voices():
-    """List available voices in the library"""
-    return voice_library.list_voices()
+@app.get("/voices", response_model=VoiceListResponse)
+async def list_voices(
+    response: Response,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    after: str = None,
+    gender: str = None,
+    age_range: str = None,
+    accent: str = None,
+    name_prefix: str = None,
+    if_none_match: str = Header(None)
+):
+    """
+    List available voices in the library, filtered and paginated
+    
+    For deep pages pass the previous page's next_after as after instead
+    of a growing offset.
+    """
+    
+    # The listing only changes when the library version does
+    etag_source = (
+        f"{voice_library.version()}:{offset}:{limit}:{after}:{gender}:{age_range}:{accent}:{name_prefix}"
+    )
+    etag = f'"{hashlib.sha1(etag_source.encode()).hexdigest()}"'
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    filters = {'gender': gender, 'age_range': age_range, 'accent': accent, 'name_prefix': name_prefix}
+    voices = voice_library.list_voices(offset=offset, limit=limit, after=after, **filters)
+    total = voice_library.count_voices(**filters)
+    next_after = voices[-1]['id'] if len(voices) == limit else None
+    
+    response.headers["ETag"] = etag
+    return VoiceListResponse(
+        voices=voices, total=total, offset=offset, limit=limit, after=after, next_after=next_after
+    )
 
 @app.post("/voices")
 async def add_voice(
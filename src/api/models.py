@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 class ConversionRequest(BaseModel):
     target_voice_id: Optional[str] = None
@@ -9,6 +9,18 @@ class ConversionResponse(BaseModel):
     output_path: Optional[str] = None
     duration: Optional[float] = None
     chunks_processed: Optional[int] = None
+    chunk_plan: Optional[Dict[str, Any]] = None
+    cache_hit: bool = False
+    error: Optional[str] = None
+
+class JobResponse(BaseModel):
+    job_id: str
+    status: str
+    chunks_done: int = 0
+    chunks_total: int = 0
+    progress: float = 0.0
+    attempts: int = 0
+    duration: Optional[float] = None
     error: Optional[str] = None
 
 class VoiceInfo(BaseModel):
@@ -17,7 +29,15 @@ class VoiceInfo(BaseModel):
     gender: Optional[str] = None
     age_range: Optional[str] = None
     accent: Optional[str] = None
-    created_at: str
+    created_at: Optional[str] = None
+
+class VoiceListResponse(BaseModel):
+    voices: List[VoiceInfo]
+    total: int
+    offset: int
+    limit: int
+    after: Optional[str] = None
+    next_after: Optional[str] = None  # pass as after to fetch the next page
 
 class AddVoiceRequest(BaseModel):
     voice_id: str
@@ -0,0 +1,65 @@
+import argparse
+import sys
+from pathlib import Path
+
+from .core.config import Config
+from .core.logger import setup_logging, get_logger
+
+logger = get_logger(__name__)
+
+def batch_command(args) -> int:
+    """Convert a directory or manifest of audio files to one library voice"""
+    from .pipeline.conversion_pipeline import VoiceConversionPipeline
+    from .pipeline.batch_processor import BatchProcessor, BatchManifest, discover_items
+
+    pipeline = VoiceConversionPipeline(args.config)
+
+    try:
+        target_embedding = pipeline.voice_library.get_voice_embedding(args.voice_id)
+        items = discover_items(args.input, args.output_dir)
+    except ValueError as e:
+        logger.error(str(e))
+        return 2
+    manifest_path = args.manifest or str(Path(args.output_dir) / ".batch_manifest.jsonl")
+    manifest = BatchManifest(manifest_path)
+
+    processor = BatchProcessor(
+        pipeline,
+        decode_workers=args.decode_workers,
+        inference_workers=args.inference_workers,
+        write_workers=args.write_workers,
+        queue_size=args.queue_size
+    )
+    stats = processor.run(items, target_embedding, manifest)
+
+    return 1 if stats['failed'] else 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Voice Conversion System")
+    parser.add_argument("--config", default="config/system_config.yaml", help="Path to system config")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    batch = subparsers.add_parser("batch", help="Convert many files with a library voice")
+    batch.add_argument("input", help="Directory of audio files or CSV manifest (source[,output])")
+    batch.add_argument("output_dir", help="Directory for converted files")
+    batch.add_argument("--voice-id", required=True, help="Target voice ID from the library")
+    batch.add_argument("--manifest", default=None,
+                       help="Progress manifest (default: <output_dir>/.batch_manifest.jsonl)")
+    batch.add_argument("--decode-workers", type=int, default=2)
+    batch.add_argument("--inference-workers", type=int, default=1)
+    batch.add_argument("--write-workers", type=int, default=2)
+    batch.add_argument("--queue-size", type=int, default=8)
+    batch.set_defaults(func=batch_command)
+
+    return parser
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    config = Config(args.config)
+    setup_logging(config.system.log_level, config.system.log_file)
+
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
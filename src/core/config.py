@@ -1,7 +1,7 @@
 import yaml
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 @dataclass
 class ModelConfig:
@@ -13,6 +13,9 @@ class ModelConfig:
     hop_length: int
     win_length: int
     n_mels: int
+    # Autocast precision for torch content-feature engines (ContentEncoder);
+    # the numpy spectral_baseline/griffin_lim engines always run in float32
+    inference_dtype: str = "float32"
     
 @dataclass
 class ProcessingConfig:
@@ -21,6 +24,31 @@ class ProcessingConfig:
     max_audio_length: int
     min_target_duration: float
     noise_threshold: float
+    max_job_audio_length: int = 14400
+    long_audio_threshold: float = 60.0
+    batch_size: int = 8
+    adaptive_chunking: bool = True
+    latency_target: float = 2.0
+    min_chunk_duration: float = 1.0
+    max_chunk_duration: float = 30.0
+    overlap_ratio: float = 0.05
+    min_overlap_duration: float = 0.1
+    initial_rtf: float = 0.5
+    vad_enabled: bool = True
+    vad_threshold_db: float = -40.0
+    vad_floor_db: float = -50.0
+    vad_min_silence: float = 0.3
+    vad_min_speech: float = 0.1
+
+@dataclass
+class JobConfig:
+    jobs_dir: str = "jobs"
+    num_workers: int = 1
+    max_attempts: int = 3
+    poll_interval: float = 1.0
+    lease_timeout: float = 120.0
+    supervise_interval: float = 5.0
+    retention: float = 604800.0
 
 @dataclass
 class SystemConfig:
@@ -29,16 +57,29 @@ class SystemConfig:
     cache_dir: str
     temp_dir: str
     voice_library_dir: str
+    jobs: JobConfig
+    log_level: str = "INFO"
+    log_file: Optional[str] = None
+    max_workers: int = 4
+    result_cache_enabled: bool = True
+    coalesce_timeout: float = 600.0
     
 class Config:
     def __init__(self, config_path: str = "config/system_config.yaml"):
+        self.config_path = config_path
         with open(config_path, 'r') as f:
             config_data = yaml.safe_load(f)
         
-        self.system = SystemConfig(**config_data)
+        self.system = SystemConfig(
+            models=ModelConfig(**config_data['models']),
+            processing=ProcessingConfig(**config_data['processing']),
+            jobs=JobConfig(**config_data.get('jobs', {})),
+            **config_data['system']
+        )
         self._setup_directories()
     
     def _setup_directories(self):
         Path(self.system.cache_dir).mkdir(parents=True, exist_ok=True)
         Path(self.system.temp_dir).mkdir(parents=True, exist_ok=True)
         Path(self.system.voice_library_dir).mkdir(parents=True, exist_ok=True)
+        Path(self.system.jobs.jobs_dir).mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,10 @@
+import numpy as np
+
+# All audio, spectral features and embeddings flow through the pipeline as
+# float32. Torch content-feature inference may run at lower precision
+# (models.inference_dtype) but hands float32 back; the numpy engines never do.
+AUDIO_DTYPE = np.float32
+
+def as_audio(audio) -> np.ndarray:
+    """View audio as a contiguous float32 array, copying only if needed"""
+    return np.ascontiguousarray(audio, dtype=AUDIO_DTYPE)
@@ -2,15 +2,31 @@ import torch
 import torch.nn as nn
 import librosa
 import numpy as np
+from dataclasses import dataclass
+from typing import List
 from transformers import Wav2Vec2Model, Wav2Vec2Processor
 
 from ..core.config import Config
+from ..core.dtypes import AUDIO_DTYPE, as_audio
 from ..core.exceptions import ModelLoadingError
 
+INFERENCE_DTYPES = {
+    'float32': torch.float32,
+    'bfloat16': torch.bfloat16,
+    'float16': torch.float16,
+}
+
+@dataclass
+class ContentFeatures:
+    """Content encoder output for a batch of chunks"""
+    features: torch.Tensor  # (batch, frames, dim), float32
+    frame_mask: torch.Tensor  # (batch, frames), False on frames that only cover padding
+
 class ContentEncoder:
     def __init__(self, config: Config):
         self.config = config
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        self.inference_dtype = self._resolve_inference_dtype(config.system.models.inference_dtype)
         self.model = None
         self.processor = None
         self.load_model()
@@ -25,20 +41,65 @@ class ContentEncoder:
         except Exception as e:
             raise ModelLoadingError(f"Failed to load content encoder: {e}")
     
-    def extract_content_features(self, audio: np.ndarray) -> torch.Tensor:
-        """Extract content features from audio"""
+    def _resolve_inference_dtype(self, name: str) -> torch.dtype:
+        """Map models.inference_dtype to a torch dtype supported on this device"""
+        if name not in INFERENCE_DTYPES:
+            raise ModelLoadingError(
+                f"Unknown inference dtype '{name}'. Available: {', '.join(INFERENCE_DTYPES)}"
+            )
+        
+        dtype = INFERENCE_DTYPES[name]
+        if dtype == torch.float16 and self.device.type == 'cpu':
+            # CPU autocast has poor float16 coverage; bfloat16 is the CPU low-precision path
+            dtype = torch.bfloat16
+        return dtype
+    
+    def _prepare_batch(self, chunks: List[np.ndarray]):
+        """Zero-padded (batch, samples) input and sample mask, normalized like Wav2Vec2FeatureExtractor"""
+        lengths = [len(chunk) for chunk in chunks]
+        batch = np.zeros((len(chunks), max(lengths)), dtype=AUDIO_DTYPE)
+        sample_mask = np.zeros(batch.shape, dtype=np.int64)
+        
+        for i, chunk in enumerate(chunks):
+            chunk = as_audio(chunk)
+            if self.processor.feature_extractor.do_normalize:
+                # Statistics over the real samples only, as the feature extractor does
+                chunk = (chunk - chunk.mean()) / np.sqrt(chunk.var() + 1e-7)
+            batch[i, :len(chunk)] = chunk
+            sample_mask[i, :len(chunk)] = 1
+        
+        # from_numpy shares memory with the float32 array; .to() is a no-op on CPU
+        return torch.from_numpy(batch).to(self.device), torch.from_numpy(sample_mask).to(self.device), lengths
+    
+    def extract_content_features_batch(self, chunks: List[np.ndarray]) -> ContentFeatures:
+        """Extract content features for a batch of chunks in one forward pass"""
         try:
-            # Preprocess audio
-            inputs = self.processor(
-                audio, 
-                sampling_rate=self.config.system.models.sample_rate, 
-                return_tensors="pt"
-            ).to(self.device)
+            input_values, attention_mask, lengths = self._prepare_batch(chunks)
             
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                content_features = outputs.last_hidden_state
+            # Checkpoints trained without attention masks (e.g. wav2vec2-base) expect
+            # plain zero padding; the mask is only passed to models that use it
+            model_kwargs = {}
+            if self.processor.feature_extractor.return_attention_mask:
+                model_kwargs['attention_mask'] = attention_mask
             
-            return content_features.squeeze(0)  # Remove batch dimension
+            with torch.no_grad(), torch.autocast(
+                device_type=self.device.type,
+                dtype=self.inference_dtype,
+                enabled=self.inference_dtype != torch.float32
+            ):
+                outputs = self.model(input_values, **model_kwargs)
+            
+            # Hand float32 back regardless of inference precision
+            features = outputs.last_hidden_state.float()
+            
+            frame_lengths = self.model._get_feat_extract_output_lengths(
+                torch.tensor(lengths, device=self.device)
+            )
+            frames = torch.arange(features.shape[1], device=self.device)
+            return ContentFeatures(features=features, frame_mask=frames[None, :] < frame_lengths[:, None])
         except Exception as e:
             raise ModelLoadingError(f"Failed to extract content features: {e}")
+    
+    def extract_content_features(self, audio: np.ndarray) -> torch.Tensor:
+        """Extract content features (frames, dim) from a single chunk"""
+        return self.extract_content_features_batch([audio]).features.squeeze(0)  # Remove batch dimension
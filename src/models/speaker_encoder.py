@@ -5,6 +5,7 @@ from resemblyzer import VoiceEncoder
 from typing import Optional
 
 from ..core.config import Config
+from ..core.dtypes import as_audio
 from ..core.exceptions import ModelLoadingError
 
 class SpeakerEncoder:
@@ -28,8 +29,8 @@ class SpeakerEncoder:
             if len(audio.shape) > 1:
                 audio = audio.squeeze()
             
-            embedding = self.encoder.embed_utterance(audio)
-            return embedding
+            embedding = self.encoder.embed_utterance(as_audio(audio))
+            return as_audio(embedding)
         except Exception as e:
             raise ModelLoadingError(f"Failed to extract speaker embedding: {e}")
     
@@ -0,0 +1,97 @@
+import numpy as np
+from functools import lru_cache
+from typing import Callable, Dict, List, Type
+
+from ..core.config import Config
+from ..core.exceptions import ModelLoadingError
+from ..preprocessing.features import FeatureFrontend, mel_filterbank
+
+class VocoderEngine:
+    """
+    Base class for vocoder engines
+
+    Engines turn a batch of mel power spectrograms (batch, n_mels, frames)
+    into a batch of waveforms (batch, samples).
+    """
+
+    name: str = None
+
+    def __init__(self, config: Config):
+        self.config = config
+
+    def synthesize_batch(self, mels: np.ndarray, length: int) -> np.ndarray:
+        """Synthesize waveforms of the given length in samples"""
+        raise NotImplementedError
+
+_VOCODERS: Dict[str, Type[VocoderEngine]] = {}
+
+def register_vocoder(name: str) -> Callable:
+    """Class decorator registering a vocoder engine under a config name"""
+    def decorator(cls: Type[VocoderEngine]) -> Type[VocoderEngine]:
+        cls.name = name
+        _VOCODERS[name] = cls
+        return cls
+    return decorator
+
+def available_vocoders() -> List[str]:
+    return sorted(_VOCODERS)
+
+def create_vocoder(config: Config) -> VocoderEngine:
+    """Instantiate the vocoder engine selected by models.vocoder_model"""
+    name = config.system.models.vocoder_model
+    if name not in _VOCODERS:
+        raise ModelLoadingError(
+            f"Unknown vocoder model '{name}'. Available: {', '.join(available_vocoders())}"
+        )
+    return _VOCODERS[name](config)
+
+@lru_cache(maxsize=8)
+def _mel_pseudo_inverse(sample_rate: int, n_fft: int, n_mels: int) -> np.ndarray:
+    inverse = np.linalg.pinv(mel_filterbank(sample_rate, n_fft, n_mels)).astype(np.float32)
+    inverse.flags.writeable = False
+    return inverse
+
+@register_vocoder("griffin_lim")
+class GriffinLimVocoder(VocoderEngine):
+    """
+    CPU baseline: batched fast Griffin-Lim phase reconstruction
+
+    Mel power is mapped back to linear magnitude with the cached
+    pseudo-inverse of the mel filterbank, then phase is estimated with
+    momentum Griffin-Lim (Perraudin et al., 2013) over the whole batch
+    at once using the shared feature frontend transforms.
+    """
+
+    def __init__(self, config: Config, n_iter: int = 32, momentum: float = 0.99, seed: int = 0):
+        super().__init__(config)
+        self.frontend = FeatureFrontend(config)
+        self.n_iter = n_iter
+        self.momentum = momentum
+        self.seed = seed
+
+    def mel_to_magnitude(self, mels: np.ndarray) -> np.ndarray:
+        inverse = _mel_pseudo_inverse(self.frontend.sample_rate, self.frontend.n_fft, self.frontend.n_mels)
+        return np.sqrt(np.maximum(inverse @ mels, 0)).astype(np.float32)
+
+    def synthesize_batch(self, mels: np.ndarray, length: int) -> np.ndarray:
+        magnitude = self.mel_to_magnitude(mels)
+        n_frames = magnitude.shape[-1]
+
+        rng = np.random.default_rng(self.seed)
+        angles = np.exp(2j * np.pi * rng.random(magnitude.shape)).astype(np.complex64)
+        previous = np.zeros_like(angles)
+
+        # Frames of the padded length the frontend would produce
+        padded_length = (n_frames - 1) * self.frontend.hop_length
+
+        for _ in range(self.n_iter):
+            signal = self.frontend.istft(magnitude * angles, length=padded_length)
+            rebuilt = self.frontend.compute(signal).stft[..., :n_frames]
+            if rebuilt.shape[-1] < n_frames:
+                rebuilt = np.pad(rebuilt, [(0, 0)] * (rebuilt.ndim - 1) + [(0, n_frames - rebuilt.shape[-1])])
+
+            angles = rebuilt - (self.momentum / (1 + self.momentum)) * previous
+            angles /= np.abs(angles) + 1e-16
+            previous = rebuilt
+
+        return self.frontend.istft(magnitude * angles, length=length)
@@ -0,0 +1,116 @@
+import numpy as np
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Type
+
+from ..core.config import Config
+from ..core.exceptions import ModelLoadingError
+
+if TYPE_CHECKING:
+    from .content_encoder import ContentFeatures
+
+class VoiceConverterEngine:
+    """
+    Base class for voice conversion engines
+
+    Engines work on batches: content features, source mel spectrograms and
+    target speaker embeddings for B chunks in, B converted mel spectrograms
+    out. Mels use the (batch, n_mels, frames) layout of FeatureFrontend.
+    Engines that set uses_content_features = False never cause the
+    content encoder to be loaded.
+    """
+
+    name: str = None
+
+    # Engines that ignore content features let the pipeline skip the content encoder
+    uses_content_features: bool = True
+
+    def __init__(self, config: Config):
+        self.config = config
+
+    def convert_batch(
+        self,
+        content_features: Optional["ContentFeatures"],
+        source_mels: np.ndarray,
+        speaker_embeddings: np.ndarray
+    ) -> np.ndarray:
+        """
+        Convert a batch of chunks to the target speakers
+
+        Args:
+            content_features: Batched content encoder output, (batch, frames,
+                dim) features with a frame mask, or None if the engine does
+                not use them
+            source_mels: Source mel power spectrograms (batch, n_mels, frames)
+            speaker_embeddings: Target speaker embeddings (batch, embedding_dim)
+        """
+        raise NotImplementedError
+
+_CONVERTERS: Dict[str, Type[VoiceConverterEngine]] = {}
+
+def register_converter(name: str) -> Callable:
+    """Class decorator registering a converter engine under a config name"""
+    def decorator(cls: Type[VoiceConverterEngine]) -> Type[VoiceConverterEngine]:
+        cls.name = name
+        _CONVERTERS[name] = cls
+        return cls
+    return decorator
+
+def available_converters() -> List[str]:
+    return sorted(_CONVERTERS)
+
+def create_converter(config: Config) -> VoiceConverterEngine:
+    """Instantiate the converter engine selected by models.voice_converter_model"""
+    name = config.system.models.voice_converter_model
+    if name not in _CONVERTERS:
+        raise ModelLoadingError(
+            f"Unknown voice converter model '{name}'. Available: {', '.join(available_converters())}"
+        )
+    return _CONVERTERS[name](config)
+
+@register_converter("spectral_baseline")
+class SpectralEnvelopeConverter(VoiceConverterEngine):
+    """
+    CPU baseline: warps the spectral envelope along the mel axis
+
+    Each target embedding is mapped to a warp ratio by projecting it on a
+    fixed random direction, so different voices get different, stable
+    pitch/formant shifts. This is a signal-processing stand-in that makes
+    the end-to-end path measurable, not a learned conversion model.
+    """
+
+    uses_content_features = False
+
+    def __init__(self, config: Config, max_shift_semitones: float = 4.0, seed: int = 0):
+        super().__init__(config)
+        self.max_shift_semitones = max_shift_semitones
+        self.seed = seed
+        self._projection = None
+
+    def warp_ratios(self, speaker_embeddings: np.ndarray) -> np.ndarray:
+        """Per-speaker frequency warp ratio, within +/- max_shift_semitones"""
+        embeddings = np.asarray(speaker_embeddings, dtype=np.float32)
+        if self._projection is None or len(self._projection) != embeddings.shape[-1]:
+            direction = np.random.default_rng(self.seed).standard_normal(embeddings.shape[-1])
+            self._projection = (direction / np.linalg.norm(direction)).astype(np.float32)
+
+        norms = np.linalg.norm(embeddings, axis=-1) + 1e-9
+        score = np.tanh(4.0 * (embeddings @ self._projection) / norms)
+        return 2.0 ** (self.max_shift_semitones * score / 12.0)
+
+    def convert_batch(
+        self,
+        content_features: Optional["ContentFeatures"],
+        source_mels: np.ndarray,
+        speaker_embeddings: np.ndarray
+    ) -> np.ndarray:
+        n_mels = source_mels.shape[1]
+        ratios = self.warp_ratios(speaker_embeddings)
+
+        # Output bin m reads source position m / ratio, linearly interpolated
+        positions = np.clip(np.arange(n_mels, dtype=np.float32)[None, :] / ratios[:, None], 0, n_mels - 1)
+        lower = np.floor(positions).astype(np.int64)
+        upper = np.minimum(lower + 1, n_mels - 1)
+        frac = (positions - lower)[:, :, None]
+
+        below = np.take_along_axis(source_mels, lower[:, :, None], axis=1)
+        above = np.take_along_axis(source_mels, upper[:, :, None], axis=1)
+        return ((1 - frac) * below + frac * above).astype(np.float32)
@@ -0,0 +1,283 @@
+import csv
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Set
+
+import numpy as np
+import soundfile as sf
+
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+
+AUDIO_EXTENSIONS = (".wav", ".flac", ".mp3", ".ogg", ".m4a")
+
+_STOP = object()
+
+@dataclass
+class BatchItem:
+    source_path: str
+    output_path: str
+
+class BatchManifest:
+    """Append-only JSONL record of completed outputs, used to resume batches"""
+
+    def __init__(self, manifest_path: str):
+        self.manifest_path = Path(manifest_path)
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.completed = self._load()
+
+    def _load(self) -> Set[str]:
+        completed = set()
+        if not self.manifest_path.exists():
+            return completed
+
+        with open(self.manifest_path, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Partial line left by a crash mid-write
+                    continue
+                completed.add(entry['output_path'])
+        return completed
+
+    def is_done(self, item: BatchItem) -> bool:
+        return item.output_path in self.completed and Path(item.output_path).exists()
+
+    def mark_done(self, item: BatchItem, duration: float):
+        entry = {
+            'source_path': item.source_path,
+            'output_path': item.output_path,
+            'duration': duration,
+            'completed_at': time.time()
+        }
+        with self._lock:
+            with open(self.manifest_path, 'a') as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.completed.add(item.output_path)
+
+def _default_output(source: Path, base: Path, output_dir: Path) -> Path:
+    """Output path mirroring the source's path relative to base, or just its name"""
+    try:
+        relative = source.resolve().relative_to(base.resolve())
+    except ValueError:
+        relative = Path(source.name)
+    return output_dir / relative.with_suffix(".wav")
+
+def discover_items(input_path: str, output_dir: str) -> List[BatchItem]:
+    """
+    Build the work list from a directory of audio files or a manifest file
+
+    A manifest is a CSV file with one source path per row and an optional
+    second column giving the output path. Default outputs keep the source
+    path relative to the input directory (or the manifest's directory);
+    sources whose default outputs would still collide, such as ``x.wav``
+    and ``x.mp3``, get a short hash of the source path appended.
+
+    Raises:
+        ValueError: If two items would write the same output file
+    """
+    input_path = Path(input_path)
+    output_dir = Path(output_dir)
+    entries = []  # (source, explicit output or None)
+
+    if input_path.is_dir():
+        base = input_path
+        for source in sorted(input_path.rglob("*")):
+            if source.suffix.lower() in AUDIO_EXTENSIONS:
+                entries.append((str(source), None))
+    else:
+        base = input_path.parent
+        with open(input_path, 'r', newline='') as f:
+            for row in csv.reader(f):
+                if not row or not row[0].strip() or row[0].startswith("#"):
+                    continue
+                output = row[1].strip() if len(row) > 1 and row[1].strip() else None
+                entries.append((row[0].strip(), output))
+
+    defaults = {
+        source: _default_output(Path(source), base, output_dir)
+        for source, output in entries if output is None
+    }
+    default_counts = Counter(defaults.values())
+
+    items = []
+    for source, output in entries:
+        if output is None:
+            output = defaults[source]
+            if default_counts[output] > 1:
+                digest = hashlib.sha1(source.encode()).hexdigest()[:8]
+                output = output.with_name(f"{output.stem}-{digest}.wav")
+        items.append(BatchItem(source, str(output)))
+
+    outputs = Counter(os.path.abspath(item.output_path) for item in items)
+    duplicates = sorted(path for path, count in outputs.items() if count > 1)
+    if duplicates:
+        raise ValueError(f"Multiple sources map to the same output: {', '.join(duplicates)}")
+
+    return items
+
+class BatchProcessor:
+    """
+    Bounded producer/consumer batch conversion
+
+    Files flow through three stages connected by bounded queues: decode and
+    preprocessing threads, an inference worker pool sharing the loaded
+    models, and encode/write threads. Queue bounds keep at most a few
+    files of decoded audio in memory regardless of batch size.
+    """
+
+    def __init__(
+        self,
+        pipeline,
+        decode_workers: int = 2,
+        inference_workers: int = 1,
+        write_workers: int = 2,
+        queue_size: int = 8,
+        report_interval: int = 100
+    ):
+        self.pipeline = pipeline
+        self.sample_rate = pipeline.config.system.models.sample_rate
+        self.decode_workers = decode_workers
+        self.inference_workers = inference_workers
+        self.write_workers = write_workers
+        self.queue_size = queue_size
+        self.report_interval = report_interval
+
+        self._stats_lock = threading.Lock()
+        self._stats = {}
+        self._start_time = 0.0
+
+    def run(
+        self,
+        items: List[BatchItem],
+        target_embedding: np.ndarray,
+        manifest: BatchManifest
+    ) -> Dict[str, float]:
+        """Convert all items not already recorded in the manifest"""
+        pending = [item for item in items if not manifest.is_done(item)]
+        self._stats = {
+            'total': len(items),
+            'skipped': len(items) - len(pending),
+            'completed': 0,
+            'failed': 0
+        }
+        logger.info(f"Batch: {len(pending)} files to convert, {self._stats['skipped']} already done")
+
+        decode_queue = queue.Queue(maxsize=self.queue_size)
+        inference_queue = queue.Queue(maxsize=self.queue_size)
+        write_queue = queue.Queue(maxsize=self.queue_size)
+
+        decoders = self._start_stage(self._decode_loop, self.decode_workers, decode_queue, inference_queue)
+        inferers = self._start_stage(
+            self._inference_loop, self.inference_workers, inference_queue, write_queue, target_embedding
+        )
+        writers = self._start_stage(self._write_loop, self.write_workers, write_queue, manifest)
+
+        self._start_time = time.time()
+        for item in pending:
+            decode_queue.put(item)
+
+        # Shut stages down in order so no item is dropped
+        self._stop_stage(decoders, decode_queue)
+        self._stop_stage(inferers, inference_queue)
+        self._stop_stage(writers, write_queue)
+
+        elapsed = time.time() - self._start_time
+        self._stats['elapsed'] = elapsed
+        self._stats['files_per_sec'] = self._stats['completed'] / elapsed if elapsed > 0 else 0.0
+        logger.info(
+            f"Batch finished: {self._stats['completed']} converted, {self._stats['failed']} failed, "
+            f"{self._stats['skipped']} skipped in {elapsed:.1f}s "
+            f"({self._stats['files_per_sec']:.2f} files/sec)"
+        )
+        return dict(self._stats)
+
+    def _start_stage(self, target, num_workers: int, *args) -> List[threading.Thread]:
+        threads = []
+        for _ in range(max(1, num_workers)):
+            thread = threading.Thread(target=target, args=args, daemon=True)
+            thread.start()
+            threads.append(thread)
+        return threads
+
+    def _stop_stage(self, threads: List[threading.Thread], input_queue: queue.Queue):
+        for _ in threads:
+            input_queue.put(_STOP)
+        for thread in threads:
+            thread.join()
+
+    def _decode_loop(self, input_queue: queue.Queue, output_queue: queue.Queue):
+        while True:
+            item = input_queue.get()
+            if item is _STOP:
+                return
+            try:
+                audio, features = self.pipeline.audio_processor.preprocess_with_features(item.source_path)
+            except Exception as e:
+                self._record_failure(item, e)
+                continue
+            output_queue.put((item, audio, features))
+
+    def _inference_loop(
+        self,
+        input_queue: queue.Queue,
+        output_queue: queue.Queue,
+        target_embedding: np.ndarray
+    ):
+        while True:
+            entry = input_queue.get()
+            if entry is _STOP:
+                return
+            item, audio, features = entry
+            try:
+                converted, _ = self.pipeline.convert_audio(audio, target_embedding, features=features)
+            except Exception as e:
+                self._record_failure(item, e)
+                continue
+            output_queue.put((item, converted))
+
+    def _write_loop(self, input_queue: queue.Queue, manifest: BatchManifest):
+        while True:
+            entry = input_queue.get()
+            if entry is _STOP:
+                return
+            item, audio = entry
+            try:
+                output_path = Path(item.output_path)
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                # Write to a temporary name so a crash never leaves a truncated output
+                temp_path = output_path.with_name(output_path.name + ".partial")
+                sf.write(str(temp_path), audio, self.sample_rate, format="WAV")
+                os.replace(temp_path, output_path)
+                manifest.mark_done(item, len(audio) / self.sample_rate)
+            except Exception as e:
+                self._record_failure(item, e)
+                continue
+            self._record_success()
+
+    def _record_success(self):
+        with self._stats_lock:
+            self._stats['completed'] += 1
+            completed = self._stats['completed']
+
+        if completed % self.report_interval == 0:
+            elapsed = time.time() - self._start_time
+            rate = completed / elapsed if elapsed > 0 else 0.0
+            logger.info(f"Batch progress: {completed} files converted ({rate:.2f} files/sec)")
+
+    def _record_failure(self, item: BatchItem, error: Exception):
+        with self._stats_lock:
+            self._stats['failed'] += 1
+        logger.error(f"Failed to convert {item.source_path}: {error}")
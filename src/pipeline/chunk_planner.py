@@ -0,0 +1,125 @@
+import math
+import threading
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional
+
+from ..core.config import Config
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+
+MODE_OFFLINE = "offline"
+MODE_STREAMING = "streaming"
+
+@dataclass
+class ChunkPlan:
+    mode: str
+    chunk_duration: float  # seconds
+    overlap_duration: float  # seconds
+    batch_size: int
+    real_time_factor: float  # compute seconds per audio second the plan assumed
+    measured: bool  # False while the real-time factor is still the configured guess
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+class ChunkPlanner:
+    """
+    Chooses chunk, overlap and batch sizes per request
+
+    The model cost is measured at runtime as an exponential moving
+    average of compute seconds per audio second (the real-time factor),
+    kept separately per batch size since batching changes the cost of
+    each second of audio. Streaming requests get the largest chunk whose buffering plus compute
+    time fits the latency target; offline requests get the longest chunks
+    allowed, split evenly so overlap is spent as rarely as possible.
+    """
+
+    def __init__(self, config: Config, smoothing: float = 0.2):
+        self.config = config
+        self.processing = config.system.processing
+        self.sample_rate = config.system.models.sample_rate
+        self.hop_length = config.system.models.hop_length
+        self.smoothing = smoothing
+
+        self._lock = threading.Lock()
+        self._rtf: Dict[int, float] = {}
+
+    def real_time_factor(self, batch_size: int = 1) -> float:
+        """Measured real-time factor at this batch size, or the configured guess"""
+        with self._lock:
+            return self._rtf.get(batch_size, self.processing.initial_rtf)
+
+    def record(self, n_samples: int, elapsed: float, batch_size: int = 1):
+        """Record the compute time spent converting n_samples of audio in batches of batch_size"""
+        if n_samples <= 0:
+            return
+
+        rtf = elapsed / (n_samples / self.sample_rate)
+        with self._lock:
+            current = self._rtf.get(batch_size)
+            self._rtf[batch_size] = rtf if current is None else current + self.smoothing * (rtf - current)
+
+    def plan(self, audio_duration: float, mode: str = MODE_OFFLINE, use_overlap: bool = True) -> ChunkPlan:
+        """Plan chunking for audio_duration seconds of audio"""
+        if not self.processing.adaptive_chunking or mode == MODE_OFFLINE:
+            batch_size = self.processing.batch_size
+        elif mode == MODE_STREAMING:
+            batch_size = 1
+        else:
+            raise ValueError(f"Unknown processing mode: {mode}")
+
+        with self._lock:
+            measured = batch_size in self._rtf
+        rtf = self.real_time_factor(batch_size)
+
+        if not self.processing.adaptive_chunking:
+            return ChunkPlan(
+                mode=mode,
+                chunk_duration=self.processing.chunk_duration,
+                overlap_duration=self.processing.overlap_duration if use_overlap else 0.0,
+                batch_size=batch_size,
+                real_time_factor=rtf,
+                measured=measured
+            )
+
+        if mode == MODE_STREAMING:
+            # A chunk must be fully buffered and then converted before it is heard
+            chunk_duration = self.processing.latency_target / (1.0 + rtf)
+        else:
+            chunk_duration = self.processing.max_chunk_duration
+
+        chunk_duration = min(max(chunk_duration, self.processing.min_chunk_duration),
+                             self.processing.max_chunk_duration)
+
+        overlap_duration = 0.0
+        if use_overlap:
+            overlap_duration = max(self.processing.min_overlap_duration,
+                                   self.processing.overlap_ratio * chunk_duration)
+
+        if mode == MODE_OFFLINE and audio_duration > 0:
+            if audio_duration <= chunk_duration:
+                chunk_duration, overlap_duration = audio_duration, 0.0
+            else:
+                # Even split avoids a short, overlap-dominated tail chunk
+                step = chunk_duration - overlap_duration
+                n_chunks = math.ceil((audio_duration - overlap_duration) / step)
+                chunk_duration = (audio_duration - overlap_duration) / n_chunks + overlap_duration
+                # Round up to whole milliseconds so rounding never adds a sliver chunk
+                chunk_duration = math.ceil(chunk_duration * 1000) / 1000
+
+        # However short the audio, a chunk spans at least one STFT hop, so
+        # rounding to milliseconds never plans an empty chunk
+        min_duration = math.ceil(self.hop_length / self.sample_rate * 1000) / 1000
+        chunk_duration = max(chunk_duration, min_duration)
+
+        plan = ChunkPlan(
+            mode=mode,
+            chunk_duration=round(chunk_duration, 3),
+            overlap_duration=round(overlap_duration, 3),
+            batch_size=batch_size,
+            real_time_factor=round(rtf, 4),
+            measured=measured
+        )
+        logger.info(f"Chunk plan: {plan}")
+        return plan
@@ -4,6 +4,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import torch
 
 from ..core.config import Config
+from ..core.dtypes import AUDIO_DTYPE
 from ..core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -57,8 +58,9 @@ class ChunkProcessor:
         for i, chunk in enumerate(chunks[1:], 1):
             if len(result) >= overlap_samples and len(chunk) >= overlap_samples:
                 # Cross-fade overlapping regions
-                fade_out = np.cos(np.linspace(0, np.pi/2, overlap_samples)) ** 2
-                fade_in = np.sin(np.linspace(0, np.pi/2, overlap_samples)) ** 2
+                ramp = np.linspace(0, np.pi/2, overlap_samples, dtype=AUDIO_DTYPE)
+                fade_out = np.cos(ramp) ** 2
+                fade_in = np.sin(ramp) ** 2
                 
                 # Apply fades
                 overlap_region = (result[-overlap_samples:] * fade_out + 
@@ -1,36 +1,72 @@
-import torch
+import hashlib
+import io
+import threading
+import time
 import numpy as np
+from dataclasses import asdict
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, List, Tuple
 import soundfile as sf
 
 from ..core.config import Config
+from ..core.dtypes import AUDIO_DTYPE, as_audio
 from ..core.logger import get_logger
 from ..preprocessing.audio_processor import AudioProcessor
+from ..preprocessing.features import SpectralFeatures
 from ..preprocessing.validators import AudioValidator
+from ..preprocessing.vad import VoiceActivityDetector
 from ..models.speaker_encoder import SpeakerEncoder
 from ..models.content_encoder import ContentEncoder
+from ..models.voice_converter import create_converter
+from ..models.vocoder import create_vocoder
 from ..storage.voice_library import VoiceLibrary
 from ..storage.cache_manager import CacheManager
+from .chunk_planner import ChunkPlanner, ChunkPlan, MODE_OFFLINE
+from .long_audio import LongAudioConverter
 
 logger = get_logger(__name__)
 
+# Bump when a code change alters conversion output, to invalidate cached results
+PIPELINE_VERSION = "2"
+
 class VoiceConversionPipeline:
     def __init__(self, config_path: str = "config/system_config.yaml"):
         self.config = Config(config_path)
         self.audio_processor = AudioProcessor(self.config)
         self.validator = AudioValidator(self.config)
+        self.vad = VoiceActivityDetector(self.config, self.audio_processor.feature_frontend)
         self.speaker_encoder = SpeakerEncoder(self.config)
-        self.content_encoder = ContentEncoder(self.config)
+        self.voice_converter = create_converter(self.config)
+        self.vocoder = create_vocoder(self.config)
         self.voice_library = VoiceLibrary(self.config)
         self.cache_manager = CacheManager(self.config)
+        self.chunk_planner = ChunkPlanner(self.config)
+        self.long_audio_converter = LongAudioConverter(self)
+        
+        # Cache keys of conversions currently running, for request coalescing
+        self._inflight: Dict[str, threading.Event] = {}
+        self._inflight_lock = threading.Lock()
+        
+        self._content_encoder: Optional[ContentEncoder] = None
+        self._content_encoder_lock = threading.Lock()
+    
+    @property
+    def content_encoder(self) -> ContentEncoder:
+        """Content encoder, loaded on first use; engines that ignore content features never load it"""
+        with self._content_encoder_lock:
+            if self._content_encoder is None:
+                logger.info("Loading content encoder")
+                self._content_encoder = ContentEncoder(self.config)
+            return self._content_encoder
     
     def convert_voice(
         self, 
         source_audio_path: str, 
         target_voice_id: Optional[str] = None,
         target_audio_path: Optional[str] = None,
-        output_path: str = "output.wav"
+        output_path: str = "output.wav",
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        mode: str = MODE_OFFLINE
     ) -> Dict[str, Any]:
         """
         Main voice conversion method
@@ -40,6 +76,8 @@ class VoiceConversionPipeline:
             target_voice_id: ID from voice library (optional)
             target_audio_path: Path to target voice sample (optional) 
             output_path: Output file path
+            progress_callback: Called as (chunks_done, chunks_total) after each chunk (optional)
+            mode: "offline" for throughput or "streaming" for latency-bound chunking
         """
         try:
             logger.info("Starting voice conversion process")
@@ -47,44 +85,44 @@ class VoiceConversionPipeline:
             # Validate inputs
             self._validate_inputs(source_audio_path, target_voice_id, target_audio_path)
             
-            # Process source audio
-            logger.info("Processing source audio")
-            source_audio = self.audio_processor.preprocess_audio(source_audio_path)
+            # Long-audio outputs are never cached, so there is nothing to wait for or share
+            if not self.config.system.result_cache_enabled or self._is_long_audio(source_audio_path):
+                return self._run_conversion(
+                    source_audio_path, target_voice_id, target_audio_path, output_path,
+                    progress_callback, mode
+                )
             
-            # Get target speaker embedding
-            logger.info("Extracting target speaker embedding")
-            target_embedding = self._get_target_embedding(target_voice_id, target_audio_path)
+            cache_key = self._result_cache_key(source_audio_path, target_voice_id, target_audio_path, mode)
+            cached = self._serve_cached_result(cache_key, output_path, progress_callback)
+            if cached:
+                return cached
             
-            # Process audio in chunks for longer files
-            chunks = self.audio_processor.chunk_audio(
-                source_audio,
-                self.config.system.processing.chunk_duration,
-                self.config.system.processing.overlap_duration
-            )
+            # Identical concurrent requests wait for the first one instead of recomputing
+            with self._inflight_lock:
+                event = self._inflight.get(cache_key)
+                is_leader = event is None
+                if is_leader:
+                    event = self._inflight[cache_key] = threading.Event()
             
-            logger.info(f"Processing {len(chunks)} audio chunks")
-            converted_chunks = []
+            if not is_leader:
+                logger.info("Waiting for identical in-flight conversion")
+                if not event.wait(self.config.system.coalesce_timeout):
+                    # Do not let a stuck leader block every follower; compute independently
+                    logger.warning("Identical in-flight conversion timed out, converting independently")
+                cached = self._serve_cached_result(cache_key, output_path, progress_callback)
+                if cached:
+                    return cached
             
-            for i, chunk in enumerate(chunks):
-                logger.info(f"Processing chunk {i+1}/{len(chunks)}")
-                converted_chunk = self._convert_chunk(chunk, target_embedding)
-                converted_chunks.append(converted_chunk)
-            
-            # Combine chunks
-            logger.info("Combining converted chunks")
-            final_audio = self._combine_chunks(converted_chunks)
-            
-            # Save output
-            sf.write(output_path, final_audio, self.config.system.models.sample_rate)
-            
-            logger.info(f"Voice conversion completed. Output saved to: {output_path}")
-            
-            return {
-                'success': True,
-                'output_path': output_path,
-                'duration': len(final_audio) / self.config.system.models.sample_rate,
-                'chunks_processed': len(chunks)
-            }
+            try:
+                return self._run_conversion(
+                    source_audio_path, target_voice_id, target_audio_path, output_path,
+                    progress_callback, mode, cache_key
+                )
+            finally:
+                if is_leader:
+                    with self._inflight_lock:
+                        del self._inflight[cache_key]
+                    event.set()
             
         except Exception as e:
             logger.error(f"Voice conversion failed: {e}")
@@ -93,6 +131,266 @@ class VoiceConversionPipeline:
                 'error': str(e)
             }
     
+    def _run_conversion(
+        self,
+        source_audio_path: str,
+        target_voice_id: Optional[str],
+        target_audio_path: Optional[str],
+        output_path: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        mode: str = MODE_OFFLINE,
+        cache_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Run the models, write the output and store it in the result cache"""
+        if self._is_long_audio(source_audio_path):
+            # Streams from and to disk; the output is not held in memory, so it is not cached
+            logger.info("Using memory-bounded long-audio mode")
+            target_embedding = self._get_target_embedding(target_voice_id, target_audio_path)
+            return self.long_audio_converter.convert(
+                source_audio_path, target_embedding, output_path, progress_callback, mode
+            )
+        
+        # Process source audio
+        logger.info("Processing source audio")
+        source_audio, source_features = self.audio_processor.preprocess_with_features(source_audio_path)
+        
+        # Get target speaker embedding
+        logger.info("Extracting target speaker embedding")
+        target_embedding = self._get_target_embedding(target_voice_id, target_audio_path)
+        
+        plan = self.plan_chunks(source_audio, mode)
+        final_audio, chunks_processed = self.convert_audio(
+            source_audio, target_embedding, progress_callback, plan, source_features
+        )
+        
+        # Encode once; the same bytes go to the output file and the cache
+        buffer = io.BytesIO()
+        sf.write(buffer, final_audio, self.config.system.models.sample_rate, format="WAV")
+        encoded = buffer.getvalue()
+        
+        # Save output
+        with open(output_path, 'wb') as f:
+            f.write(encoded)
+        
+        logger.info(f"Voice conversion completed. Output saved to: {output_path}")
+        
+        duration = len(final_audio) / self.config.system.models.sample_rate
+        if cache_key is not None:
+            self.cache_manager.cache_conversion_result(cache_key, {
+                'audio': encoded,
+                'duration': duration,
+                'chunks_processed': chunks_processed,
+                'chunk_plan': plan.to_dict()
+            })
+        
+        return {
+            'success': True,
+            'output_path': output_path,
+            'duration': duration,
+            'chunks_processed': chunks_processed,
+            'chunk_plan': plan.to_dict(),
+            'cache_hit': False
+        }
+    
+    def _is_long_audio(self, source_path: str) -> bool:
+        """Whether the source should be converted block-wise from disk"""
+        try:
+            duration = sf.info(source_path).duration
+        except RuntimeError:
+            # Formats libsndfile cannot open go through the in-memory path
+            return False
+        return duration > self.config.system.processing.long_audio_threshold
+    
+    def _result_cache_key(
+        self,
+        source_path: str,
+        target_voice_id: Optional[str],
+        target_audio_path: Optional[str],
+        mode: str
+    ) -> str:
+        """Hash of source bytes, target voice and the model/config versions"""
+        hasher = hashlib.sha256()
+        hasher.update(PIPELINE_VERSION.encode())
+        hasher.update(mode.encode())
+        hasher.update(repr(asdict(self.config.system.models)).encode())
+        hasher.update(repr(asdict(self.config.system.processing)).encode())
+        
+        _hash_file(hasher, source_path)
+        
+        if target_voice_id:
+            embedding = self.voice_library.get_voice_embedding(target_voice_id)
+            hasher.update(np.ascontiguousarray(embedding, dtype=np.float32).tobytes())
+        else:
+            # Hash the upload itself so a hit skips the speaker encoder too
+            _hash_file(hasher, target_audio_path)
+        
+        return hasher.hexdigest()
+    
+    def _serve_cached_result(
+        self,
+        cache_key: str,
+        output_path: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Write a cached output to output_path, if one exists"""
+        cached = self.cache_manager.get_cached_conversion_result(cache_key)
+        if cached is None:
+            return None
+        
+        with open(output_path, 'wb') as f:
+            f.write(cached['audio'])
+        
+        # Report the whole conversion as done, as a computed one would
+        if progress_callback:
+            progress_callback(cached['chunks_processed'], cached['chunks_processed'])
+        
+        logger.info(f"Served cached conversion result. Output saved to: {output_path}")
+        
+        return {
+            'success': True,
+            'output_path': output_path,
+            'duration': cached['duration'],
+            'chunks_processed': cached['chunks_processed'],
+            'chunk_plan': cached['chunk_plan'],
+            'cache_hit': True
+        }
+    
+    def convert_audio(
+        self,
+        source_audio: np.ndarray,
+        target_embedding: np.ndarray,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        plan: Optional[ChunkPlan] = None,
+        features: Optional[SpectralFeatures] = None
+    ) -> Tuple[np.ndarray, int]:
+        """
+        Convert preprocessed audio to the target voice
+        
+        Args:
+            features: Frontend features of source_audio, if already computed.
+                VAD and every chunk reuse slices of this one STFT.
+        
+        Returns:
+            Converted audio and the number of chunks processed
+        """
+        if plan is None:
+            plan = self.plan_chunks(source_audio)
+        if features is None:
+            features = self.audio_processor.feature_frontend.compute(source_audio)
+        
+        if self.config.system.processing.vad_enabled:
+            return self._convert_speech_segments(
+                source_audio, target_embedding, plan, features, progress_callback
+            )
+        
+        # Chunk on STFT frame boundaries so chunks can share the features
+        sample_rate = self.config.system.models.sample_rate
+        hop = features.hop_length
+        chunk_samples = -(-round(plan.chunk_duration * sample_rate) // hop) * hop
+        overlap_samples = round(plan.overlap_duration * sample_rate) // hop * hop
+        bounds = self.audio_processor.chunk_bounds(len(source_audio), chunk_samples, overlap_samples)
+        
+        logger.info(f"Processing {len(bounds)} audio chunks")
+        converted_chunks = self._convert_in_batches(
+            [source_audio[start:end] for start, end in bounds],
+            target_embedding,
+            plan.batch_size,
+            progress_callback,
+            [features.span(start, end) for start, end in bounds]
+        )
+        
+        # Combine chunks
+        logger.info("Combining converted chunks")
+        return self._combine_chunks(converted_chunks, overlap_samples), len(bounds)
+    
+    def plan_chunks(self, source_audio: np.ndarray, mode: str = MODE_OFFLINE) -> ChunkPlan:
+        """Choose chunk sizes for this audio from the measured model cost"""
+        # VAD segments also need overlap: long speech runs are cut into chunks too
+        return self.chunk_planner.plan(len(source_audio) / self.config.system.models.sample_rate, mode)
+    
+    def _convert_speech_segments(
+        self,
+        source_audio: np.ndarray,
+        target_embedding: np.ndarray,
+        plan: ChunkPlan,
+        features: SpectralFeatures,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> Tuple[np.ndarray, int]:
+        """
+        Convert only speech segments, passing silence through untouched
+        
+        Segments that continue a speech run cut by the VAD are converted
+        with the planned overlap before the cut and cross-faded into the
+        previous segment; only real speech/silence boundaries are hard.
+        """
+        hop = features.hop_length
+        overlap_samples = round(plan.overlap_duration * self.config.system.models.sample_rate) // hop * hop
+        
+        # Leave room for the overlap so converted spans stay within the planned chunk
+        max_segment = plan.chunk_duration - plan.overlap_duration
+        segments = self.vad.segment(source_audio, max_segment, features)
+        speech_segments = [segment for segment in segments if segment.is_speech]
+        
+        logger.info(
+            f"Processing {len(speech_segments)} speech segments "
+            f"({len(segments) - len(speech_segments)} silent segments skipped)"
+        )
+        
+        spans = []
+        for i, segment in enumerate(speech_segments):
+            start = segment.start
+            if segment.continues:
+                start = max(speech_segments[i - 1].start, segment.start - overlap_samples)
+            spans.append((start, segment.end))
+        
+        converted_segments = self._convert_in_batches(
+            [source_audio[start:end] for start, end in spans],
+            target_embedding,
+            plan.batch_size,
+            progress_callback,
+            [features.span(start, end) for start, end in spans]
+        )
+        
+        # Silent spans keep their original samples, so timing is preserved
+        result = source_audio.copy()
+        for segment, (start, end), converted in zip(speech_segments, spans, converted_segments):
+            fade = segment.start - start
+            if fade:
+                fade_in = np.linspace(0, 1, fade, dtype=AUDIO_DTYPE)
+                result[start:segment.start] += fade_in * (converted[:fade] - result[start:segment.start])
+            result[segment.start:end] = converted[fade:]
+        
+        return result, len(speech_segments)
+    
+    def _convert_in_batches(
+        self,
+        chunks: List[np.ndarray],
+        target_embedding: np.ndarray,
+        batch_size: int,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        features: Optional[List[SpectralFeatures]] = None
+    ) -> List[np.ndarray]:
+        """Convert chunks batch_size at a time, reporting progress per chunk"""
+        converted_chunks = []
+        
+        for start in range(0, len(chunks), batch_size):
+            batch = chunks[start:start + batch_size]
+            batch_features = features[start:start + batch_size] if features is not None else None
+            logger.info(f"Processing chunks {start+1}-{start+len(batch)}/{len(chunks)}")
+            
+            batch_start = time.perf_counter()
+            converted_chunks.extend(self._convert_batch(batch, target_embedding, batch_features))
+            
+            # Feed measured model cost back into chunk planning
+            self.chunk_planner.record(
+                sum(len(chunk) for chunk in batch), time.perf_counter() - batch_start, batch_size
+            )
+            
+            if progress_callback:
+                progress_callback(len(converted_chunks), len(chunks))
+        
+        return converted_chunks
+    
     def _validate_inputs(self, source_path, target_voice_id, target_audio_path):
         """Validate input parameters"""
         if not Path(source_path).exists():
@@ -118,57 +416,57 @@ class VoiceConversionPipeline:
             target_audio = self.audio_processor.preprocess_audio(audio_path)
             return self.speaker_encoder.extract_embedding(target_audio)
     
-    def _convert_chunk(self, audio_chunk: np.ndarray, target_embedding: np.ndarray) -> np.ndarray:
-        """Convert a single audio chunk"""
-        # Extract content features
-        content_features = self.content_encoder.extract_content_features(audio_chunk)
-        
-        # This is where you'd integrate your actual voice conversion model
-        # For now, returning the original chunk as placeholder
-        # In real implementation, you'd use AutoVC, VQ-VAE, or GAN-based model
-        
-        # Placeholder conversion logic
-        converted_chunk = self._apply_voice_conversion(
-            audio_chunk, content_features, target_embedding
+    def _convert_batch(
+        self,
+        chunks: List[np.ndarray],
+        target_embedding: np.ndarray,
+        features: Optional[List[SpectralFeatures]] = None
+    ) -> List[np.ndarray]:
+        """Convert a batch of chunks: features -> converter -> vocoder"""
+        lengths = [len(chunk) for chunk in chunks]
+        max_length = max(lengths)
+        frontend = self.audio_processor.feature_frontend
+        
+        if features is None:
+            # Zero-pad to a common length so the batch shares one STFT call
+            batch = np.zeros((len(chunks), max_length), dtype=AUDIO_DTYPE)
+            for i, chunk in enumerate(chunks):
+                batch[i, :len(chunk)] = chunk
+            source_mels = frontend.compute(batch).mel
+        else:
+            # Precomputed chunk features, padded to the frame count of the longest chunk
+            source_mels = np.zeros(
+                (len(chunks), frontend.n_mels, 1 + max_length // frontend.hop_length), dtype=np.float32
+            )
+            for i, chunk_features in enumerate(features):
+                source_mels[i, :, :chunk_features.n_frames] = chunk_features.mel
+        
+        content_features = None
+        if self.voice_converter.uses_content_features:
+            content_features = self.content_encoder.extract_content_features_batch(chunks)
+        
+        speaker_embeddings = np.repeat(
+            as_audio(target_embedding)[None, :], len(chunks), axis=0
         )
         
-        return converted_chunk
-    
-    def _apply_voice_conversion(
-        self, 
-        audio: np.ndarray, 
-        content: torch.Tensor, 
-        speaker_embedding: np.ndarray
-    ) -> np.ndarray:
-        """
-        Placeholder for actual voice conversion model
-        Replace with your chosen model (AutoVC, VQ-VAE, etc.)
-        """
-        # This is where the magic happens with your chosen model
-        # For MVP, you could start with a simple spectral manipulation approach
+        mels = self.voice_converter.convert_batch(content_features, source_mels, speaker_embeddings)
+        waveforms = as_audio(self.vocoder.synthesize_batch(mels, max_length))
         
-        # Placeholder: return original audio (replace with actual conversion)
-        logger.warning("Using placeholder conversion - implement actual model here")
-        return audio
+        return [waveforms[i, :length] for i, length in enumerate(lengths)]
     
-    def _combine_chunks(self, chunks: list) -> np.ndarray:
+    def _combine_chunks(self, chunks: list, overlap_samples: int) -> np.ndarray:
         """Combine overlapping chunks using overlap-add method"""
         if len(chunks) == 1:
             return chunks[0]
         
-        overlap_samples = int(
-            self.config.system.processing.overlap_duration * 
-            self.config.system.models.sample_rate
-        )
-        
         # Simple concatenation with fade in/out for overlap
         result = chunks[0]
         
         for chunk in chunks[1:]:
             # Apply fade in/out for smoother transitions
             if len(result) >= overlap_samples:
-                fade_out = np.linspace(1, 0, overlap_samples)
-                fade_in = np.linspace(0, 1, overlap_samples)
+                fade_out = np.linspace(1, 0, overlap_samples, dtype=AUDIO_DTYPE)
+                fade_in = np.linspace(0, 1, overlap_samples, dtype=AUDIO_DTYPE)
                 
                 result[-overlap_samples:] *= fade_out
                 chunk[:overlap_samples] *= fade_in
@@ -179,3 +477,8 @@ class VoiceConversionPipeline:
                 result = np.concatenate([result, chunk])
         
         return result
+
+def _hash_file(hasher, path: str, block_size: int = 1 << 20):
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            hasher.update(block)
@@ -0,0 +1,164 @@
+import multiprocessing as mp
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional
+
+from ..core.config import Config
+from ..core.logger import get_logger
+from ..storage.job_queue import JobQueue
+
+logger = get_logger(__name__)
+
+class JobWorker:
+    """Pulls conversion jobs from the persistent queue and runs them"""
+
+    def __init__(self, config_path: str = "config/system_config.yaml"):
+        self.config_path = config_path
+        self.config = Config(config_path)
+        self.queue = JobQueue(self.config)
+        self.poll_interval = self.config.system.jobs.poll_interval
+        self.heartbeat_interval = self.config.system.jobs.lease_timeout / 3
+        self.pid = os.getpid()
+        self.pipeline = None
+
+    def _load_pipeline(self):
+        """Load models lazily so idle workers start quickly"""
+        if self.pipeline is None:
+            from .conversion_pipeline import VoiceConversionPipeline
+            self.pipeline = VoiceConversionPipeline(self.config_path)
+        return self.pipeline
+
+    @contextmanager
+    def _lease(self, job_id: str):
+        """Renew the job's lease in the background while it is being processed"""
+        done = threading.Event()
+
+        def renew():
+            while not done.wait(self.heartbeat_interval):
+                if not self.queue.heartbeat(job_id, self.pid):
+                    logger.warning(f"Worker {self.pid} lost the lease on job {job_id}")
+                    return
+
+        thread = threading.Thread(target=renew, name=f"lease-{job_id}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+
+    def run_once(self) -> bool:
+        """Process a single job. Returns False if the queue was empty"""
+        job = self.queue.claim(self.pid)
+        if job is None:
+            return False
+
+        job_id = job['id']
+        logger.info(f"Worker {self.pid} processing job {job_id} (attempt {job['attempts']})")
+
+        try:
+            with self._lease(job_id):
+                pipeline = self._load_pipeline()
+                result = pipeline.convert_voice(
+                    source_audio_path=job['source_path'],
+                    target_voice_id=job['target_voice_id'],
+                    target_audio_path=job['target_audio_path'],
+                    output_path=job['output_path'],
+                    progress_callback=lambda done, total: self.queue.update_progress(job_id, self.pid, done, total)
+                )
+        except Exception as e:
+            self.queue.fail(job_id, self.pid, str(e))
+            return True
+
+        if result['success']:
+            self.queue.complete(job_id, self.pid, result['duration'])
+        else:
+            self.queue.fail(job_id, self.pid, result['error'])
+        return True
+
+    def run_forever(self):
+        """Poll the queue until the process is terminated"""
+        logger.info(f"Job worker {self.pid} started")
+        while True:
+            if not self.run_once():
+                time.sleep(self.poll_interval)
+
+def _worker_main(config_path: str):
+    JobWorker(config_path).run_forever()
+
+class WorkerPool:
+    """
+    Keeps a fixed number of job worker processes running
+
+    A supervisor thread respawns workers that exit (for example when
+    OOM-killed mid-job) and periodically recovers running jobs whose
+    worker died or whose lease expired, so they are retried without
+    waiting for an API restart. It also purges finished jobs past the
+    retention period, so job files do not accumulate on disk.
+    """
+
+    def __init__(self, config_path: str = "config/system_config.yaml", num_workers: int = None):
+        self.config_path = config_path
+        self.config = Config(config_path)
+        self.num_workers = num_workers if num_workers is not None else self.config.system.jobs.num_workers
+        self.supervise_interval = self.config.system.jobs.supervise_interval
+        self.queue = JobQueue(self.config)
+
+        # Spawn rather than fork so workers do not inherit torch/thread state
+        self._ctx = mp.get_context("spawn")
+        self.processes: List[mp.Process] = []
+        self._stopped = threading.Event()
+        self._supervisor: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start worker processes and the supervisor thread"""
+        self.queue.requeue_stale()
+
+        self._stopped.clear()
+        self.processes = [self._spawn() for _ in range(self.num_workers)]
+        logger.info(f"Started {len(self.processes)} job workers")
+
+        self._supervisor = threading.Thread(target=self._supervise, name="job-supervisor", daemon=True)
+        self._supervisor.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the supervisor and terminate worker processes"""
+        self._stopped.set()
+        if self._supervisor is not None:
+            self._supervisor.join()
+            self._supervisor = None
+
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join(timeout)
+        self.processes = []
+
+    def check(self) -> int:
+        """Respawn dead workers, recover their jobs and purge expired ones. Returns the number respawned"""
+        respawned = 0
+        for i, process in enumerate(self.processes):
+            if process.is_alive():
+                continue
+            logger.warning(f"Job worker {process.pid} exited with code {process.exitcode}, respawning")
+            process.join(0)
+            self.processes[i] = self._spawn()
+            respawned += 1
+
+        self.queue.requeue_stale()
+        self.queue.purge_expired()
+        return respawned
+
+    def _spawn(self) -> mp.Process:
+        process = self._ctx.Process(target=_worker_main, args=(self.config_path,), daemon=True)
+        process.start()
+        return process
+
+    def _supervise(self):
+        while not self._stopped.wait(self.supervise_interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Job worker supervision failed: {e}")
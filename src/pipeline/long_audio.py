@@ -0,0 +1,165 @@
+import math
+from typing import Callable, Dict, Any, Optional
+
+import numpy as np
+import soundfile as sf
+from scipy.signal import resample_poly
+
+from ..core.dtypes import AUDIO_DTYPE, as_audio
+from ..core.logger import get_logger
+from .chunk_planner import MODE_OFFLINE
+
+logger = get_logger(__name__)
+
+class LongAudioConverter:
+    """
+    Converts recordings of any length with bounded memory
+
+    The source is read from disk one block at a time with ``soundfile``
+    (resampled, normalized and denoised per block), each block goes
+    through the regular in-memory conversion, and the result is appended
+    to the output file as it is produced. Consecutive blocks overlap and
+    are cross-faded; only the overlap tail is carried between blocks, so
+    peak memory depends on the block size, not on the recording length.
+    """
+
+    def __init__(self, pipeline, context_duration: float = 0.05):
+        self.pipeline = pipeline
+        self.config = pipeline.config
+        self.sample_rate = self.config.system.models.sample_rate
+        self.context_duration = context_duration
+
+    def convert(
+        self,
+        source_path: str,
+        target_embedding: np.ndarray,
+        output_path: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        mode: str = MODE_OFFLINE
+    ) -> Dict[str, Any]:
+        info = sf.info(source_path)
+        total_samples = int(math.ceil(info.frames * self.sample_rate / info.samplerate))
+
+        # Blocks always overlap so block seams can be cross-faded
+        plan = self.pipeline.chunk_planner.plan(info.duration, mode, use_overlap=True)
+        chunk_samples = int(plan.chunk_duration * self.sample_rate)
+        overlap_samples = int(plan.overlap_duration * self.sample_rate)
+
+        # A block holds batch_size chunks so each block is one batched model call
+        block_samples = plan.batch_size * chunk_samples - (plan.batch_size - 1) * overlap_samples
+        step = block_samples - overlap_samples
+        total_blocks = 1 + max(0, math.ceil((total_samples - block_samples) / step))
+        chunks_total = total_blocks * plan.batch_size
+
+        peak = self._scan_peak(source_path)
+        logger.info(
+            f"Long-audio conversion: {info.duration:.1f}s in {total_blocks} blocks "
+            f"of {block_samples / self.sample_rate:.1f}s"
+        )
+
+        chunks_processed = 0
+        samples_written = 0
+        tail = None
+
+        with sf.SoundFile(source_path) as source, \
+                sf.SoundFile(output_path, 'w', samplerate=self.sample_rate, channels=1,
+                             format='WAV', subtype='PCM_16') as output:
+            for block_index in range(total_blocks):
+                start = block_index * step
+                end = min(start + block_samples, total_samples)
+
+                block = self._read_block(source, start, end, peak)
+                block_progress = self._block_progress(progress_callback, block_index, plan.batch_size, chunks_total)
+                converted, n_chunks = self.pipeline.convert_audio(
+                    block, target_embedding, block_progress, plan=plan
+                )
+                chunks_processed += n_chunks
+
+                if tail is not None:
+                    converted = converted.copy()
+                    converted[:len(tail)] = self._crossfade(tail, converted[:len(tail)])
+
+                is_last = block_index == total_blocks - 1
+                if is_last or len(converted) <= overlap_samples:
+                    output.write(converted)
+                    samples_written += len(converted)
+                    tail = None
+                else:
+                    output.write(converted[:-overlap_samples])
+                    samples_written += len(converted) - overlap_samples
+                    tail = converted[-overlap_samples:].copy()
+
+                if progress_callback:
+                    # Blocks whose audio VAD skipped entirely report no chunks of their own
+                    progress_callback((block_index + 1) * plan.batch_size, chunks_total)
+
+            if tail is not None:
+                output.write(tail)
+                samples_written += len(tail)
+
+        logger.info(f"Long-audio conversion completed. Output saved to: {output_path}")
+
+        return {
+            'success': True,
+            'output_path': output_path,
+            'duration': samples_written / self.sample_rate,
+            'chunks_processed': chunks_processed,
+            'chunk_plan': plan.to_dict(),
+            'cache_hit': False
+        }
+
+    @staticmethod
+    def _block_progress(
+        progress_callback: Optional[Callable[[int, int], None]],
+        block_index: int,
+        chunks_per_block: int,
+        chunks_total: int
+    ) -> Optional[Callable[[int, int], None]]:
+        """Map per-chunk progress inside a block to chunk progress over the whole file"""
+        if progress_callback is None:
+            return None
+
+        def report(done: int, total: int):
+            progress_callback(block_index * chunks_per_block + done * chunks_per_block // total, chunks_total)
+        return report
+
+    def _scan_peak(self, source_path: str) -> float:
+        """Peak of the mono mix, read block-wise, for whole-file normalization"""
+        peak = 0.0
+        for block in sf.blocks(source_path, blocksize=1 << 18, dtype='float32', always_2d=True):
+            if len(block):
+                peak = max(peak, float(np.abs(block.mean(axis=1)).max()))
+        return peak
+
+    def _read_block(self, source: sf.SoundFile, start: int, end: int, peak: float) -> np.ndarray:
+        """Read model-rate samples [start, end) as normalized, denoised mono audio"""
+        source_rate = source.samplerate
+        ratio = source_rate / self.sample_rate
+
+        # Read a little context on both sides so resampling has no edge effects
+        context = int(self.context_duration * source_rate)
+        read_start = max(0, int(math.floor(start * ratio)) - context)
+        read_end = min(source.frames, int(math.ceil(end * ratio)) + context)
+
+        source.seek(read_start)
+        audio = source.read(read_end - read_start, dtype='float32', always_2d=True)
+        audio = audio.mean(axis=1, dtype=AUDIO_DTYPE)
+
+        if source_rate != self.sample_rate:
+            divisor = math.gcd(self.sample_rate, source_rate)
+            audio = as_audio(resample_poly(audio, self.sample_rate // divisor, source_rate // divisor))
+
+        offset = int(round(start - read_start / ratio))
+        audio = audio[offset:offset + (end - start)]
+        if len(audio) < end - start:
+            audio = np.pad(audio, (0, end - start - len(audio)))
+
+        # Same steps as AudioProcessor.preprocess_audio, with the whole-file peak;
+        # end trimming is skipped since it would shift the block timeline
+        audio *= AUDIO_DTYPE(1.0 / (peak + 1e-9))
+        return self.pipeline.audio_processor.reduce_noise(audio)
+
+    @staticmethod
+    def _crossfade(tail: np.ndarray, head: np.ndarray) -> np.ndarray:
+        fade_in = np.linspace(0, 1, len(tail), dtype=AUDIO_DTYPE)
+        return tail * (1 - fade_in) + head * fade_in
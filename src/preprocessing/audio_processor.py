@@ -2,66 +2,111 @@ import librosa
 import numpy as np
 import torch
 import torchaudio
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
 from pathlib import Path
 import noisereduce as nr
 
 from ..core.config import Config
+from ..core.dtypes import AUDIO_DTYPE, as_audio
 from ..core.exceptions import AudioProcessingError
+from .features import FeatureFrontend, SpectralFeatures
 
 class AudioProcessor:
     def __init__(self, config: Config):
         self.config = config
         self.sample_rate = config.system.models.sample_rate
+        self.feature_frontend = FeatureFrontend(config)
         
     def load_audio(self, audio_path: str) -> np.ndarray:
         """Load and preprocess audio file"""
         try:
-            audio, sr = librosa.load(audio_path, sr=self.sample_rate, mono=True)
-            return audio
+            audio, sr = librosa.load(audio_path, sr=self.sample_rate, mono=True, dtype=AUDIO_DTYPE)
+            return as_audio(audio)
         except Exception as e:
             raise AudioProcessingError(f"Failed to load audio: {e}")
     
     def normalize_audio(self, audio: np.ndarray) -> np.ndarray:
         """Normalize audio amplitude"""
-        audio = audio / np.max(np.abs(audio) + 1e-9)
-        return audio
+        # Scale by a float32 scalar so the result is not promoted to float64
+        scale = AUDIO_DTYPE(1.0 / (np.max(np.abs(audio)) + 1e-9))
+        return as_audio(audio) * scale
     
     def reduce_noise(self, audio: np.ndarray) -> np.ndarray:
         """Apply noise reduction"""
         try:
             reduced_noise = nr.reduce_noise(y=audio, sr=self.sample_rate)
-            return reduced_noise
+            return as_audio(reduced_noise)
         except Exception as e:
             print(f"Noise reduction warning: {e}")
             return audio
     
-    def trim_silence(self, audio: np.ndarray, threshold: float = 0.01) -> np.ndarray:
+    def trim_silence(
+        self,
+        audio: np.ndarray,
+        threshold: float = 0.01,
+        features: Optional[SpectralFeatures] = None
+    ) -> np.ndarray:
         """Remove silence from beginning and end"""
-        trimmed, _ = librosa.effects.trim(audio, top_db=20)
-        return trimmed
+        if features is None:
+            features = self.feature_frontend.compute(audio)
+        
+        start, end = self._trim_bounds(len(audio), features)
+        return audio[start:end]
+    
+    def _trim_bounds(self, n_samples: int, features: SpectralFeatures) -> Tuple[int, int]:
+        # Same rule as librosa.effects.trim(top_db=20), on the shared STFT
+        non_silent = np.flatnonzero(features.frame_energy_db > -20)
+        if len(non_silent) == 0:
+            return 0, 0
+        
+        start = int(non_silent[0]) * features.hop_length
+        end = min(n_samples, (int(non_silent[-1]) + 1) * features.hop_length)
+        return start, end
     
     def preprocess_audio(self, audio_path: str) -> np.ndarray:
         """Complete preprocessing pipeline"""
+        audio, _ = self.preprocess_with_features(audio_path)
+        return audio
+    
+    def preprocess_with_features(self, audio_path: str) -> Tuple[np.ndarray, SpectralFeatures]:
+        """
+        Preprocess audio and return it with its spectral features
+        
+        The STFT computed for trimming is kept and sliced to the trimmed
+        audio, so later stages (VAD, conversion) do not compute it again.
+        """
         audio = self.load_audio(audio_path)
         audio = self.normalize_audio(audio)
         audio = self.reduce_noise(audio)
-        audio = self.trim_silence(audio)
-        return audio
+        
+        features = self.feature_frontend.compute(audio)
+        start, end = self._trim_bounds(len(audio), features)
+        return audio[start:end], features.span(start, end)
     
-    def chunk_audio(self, audio: np.ndarray, chunk_duration: float, overlap: float) -> list:
-        """Split audio into overlapping chunks"""
-        chunk_samples = int(chunk_duration * self.sample_rate)
-        overlap_samples = int(overlap * self.sample_rate)
+    def chunk_bounds(self, n_samples: int, chunk_samples: int, overlap_samples: int) -> List[Tuple[int, int]]:
+        """(start, end) sample bounds of overlapping chunks covering n_samples"""
         step = chunk_samples - overlap_samples
+        if step <= 0:
+            raise AudioProcessingError(
+                f"Overlap of {overlap_samples} samples must be shorter than chunks of {chunk_samples}"
+            )
         
-        chunks = []
-        for i in range(0, len(audio) - chunk_samples + 1, step):
-            chunk = audio[i:i + chunk_samples]
-            chunks.append(chunk)
+        bounds = []
+        start = 0
+        while True:
+            bounds.append((start, min(start + chunk_samples, n_samples)))
+            if start + chunk_samples >= n_samples:
+                break
+            start += step
         
-        # Handle remaining audio
-        if len(audio) % step != 0:
-            chunks.append(audio[-chunk_samples:])
-            
-        return chunks
+        # The last chunk may be shorter, but it always overlaps its
+        # predecessor by exactly overlap_samples so recombination
+        # reproduces the input length
+        return bounds
+    
+    def chunk_audio(self, audio: np.ndarray, chunk_duration: float, overlap: float) -> list:
+        """Split audio into overlapping chunks"""
+        bounds = self.chunk_bounds(
+            len(audio), int(chunk_duration * self.sample_rate), int(overlap * self.sample_rate)
+        )
+        return [audio[start:end] for start, end in bounds]
@@ -0,0 +1,237 @@
+import librosa
+import numpy as np
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Optional
+
+from ..core.config import Config
+
+@lru_cache(maxsize=8)
+def hann_window(n_fft: int) -> np.ndarray:
+    """Periodic Hann window, cached per size"""
+    n = np.arange(n_fft, dtype=np.float32)
+    window = 0.5 - 0.5 * np.cos(2 * np.pi * n / n_fft, dtype=np.float32)
+    window.flags.writeable = False
+    return window
+
+@lru_cache(maxsize=8)
+def mel_filterbank(sample_rate: int, n_fft: int, n_mels: int) -> np.ndarray:
+    """Mel filterbank matrix (n_mels, n_fft // 2 + 1), cached per configuration"""
+    basis = librosa.filters.mel(sr=sample_rate, n_fft=n_fft, n_mels=n_mels).astype(np.float32)
+    basis.flags.writeable = False
+    return basis
+
+@dataclass
+class SpectralFeatures:
+    """
+    STFT of an audio chunk with derived features computed on first access
+
+    Arrays use librosa's (bins, frames) layout, with a leading batch
+    axis when computed for a batch of chunks. Frame k is centred on
+    sample ``k * hop_length`` of the chunk.
+    """
+    stft: np.ndarray
+    sample_rate: int
+    n_fft: int
+    hop_length: int
+    n_mels: int
+
+    @property
+    def n_frames(self) -> int:
+        return self.stft.shape[-1]
+
+    @cached_property
+    def magnitude(self) -> np.ndarray:
+        return np.abs(self.stft)
+
+    @cached_property
+    def power(self) -> np.ndarray:
+        return self.magnitude ** 2
+
+    @cached_property
+    def mel(self) -> np.ndarray:
+        """Mel power spectrogram (n_mels, frames)"""
+        return mel_filterbank(self.sample_rate, self.n_fft, self.n_mels) @ self.power
+
+    @cached_property
+    def log_mel(self) -> np.ndarray:
+        return np.log(self.mel + 1e-6)
+
+    @cached_property
+    def frame_dbfs(self) -> np.ndarray:
+        """Per-frame window-weighted mean-square energy in dBFS"""
+        # Parseval over the one-sided spectrum: bins other than DC and Nyquist count twice
+        weights = np.full(self.stft.shape[-2], 2.0, dtype=np.float32)
+        weights[0] = weights[-1] = 1.0
+        window = hann_window(self.n_fft)
+        energy = np.einsum('k,...kt->...t', weights, self.power) / (self.n_fft * np.dot(window, window))
+        return 10 * np.log10(energy + 1e-10)
+
+    @cached_property
+    def frame_energy_db(self) -> np.ndarray:
+        """Per-frame energy in dB relative to the loudest frame"""
+        energy_db = self.frame_dbfs
+        if energy_db.shape[-1] == 0:
+            return energy_db
+        return energy_db - energy_db.max(axis=-1, keepdims=True)
+
+    def span(self, start: int, end: int) -> "SpectralFeatures":
+        """
+        Features of the sub-chunk audio[start:end], without recomputing the STFT
+
+        Frames are shared with this chunk, so frames next to the span
+        boundaries see the surrounding audio instead of reflect padding.
+        start must be a multiple of hop_length.
+        """
+        if start % self.hop_length:
+            raise ValueError(f"Span start {start} is not a multiple of hop_length {self.hop_length}")
+
+        first = start // self.hop_length
+        return SpectralFeatures(
+            stft=self.stft[..., first:first + 1 + (end - start) // self.hop_length],
+            sample_rate=self.sample_rate,
+            n_fft=self.n_fft,
+            hop_length=self.hop_length,
+            n_mels=self.n_mels
+        )
+
+class FeatureFrontend:
+    """
+    Computes the STFT once per chunk for all pipeline stages
+
+    Window and mel filterbank matrices are cached per configuration and
+    shared between instances.
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.sample_rate = config.system.models.sample_rate
+        self.n_fft = config.system.models.win_length
+        self.hop_length = config.system.models.hop_length
+        self.n_mels = config.system.models.n_mels
+        self.window = hann_window(self.n_fft)
+
+    def compute(self, audio: np.ndarray, center: bool = True) -> SpectralFeatures:
+        """Compute spectral features for a chunk, or a (batch, samples) array of chunks"""
+        audio = np.asarray(audio, dtype=np.float32)
+        if center:
+            pad = self.n_fft // 2
+            mode = 'reflect' if audio.shape[-1] > pad else 'constant'
+            audio = np.pad(audio, [(0, 0)] * (audio.ndim - 1) + [(pad, pad)], mode=mode)
+
+        return self._features(self._stft(audio))
+
+    def istft(self, stft: np.ndarray, length: Optional[int] = None) -> np.ndarray:
+        """Inverse of compute(center=True) by windowed overlap-add; batch axes are kept"""
+        frames = np.fft.irfft(np.swapaxes(stft, -1, -2), n=self.n_fft, axis=-1).astype(np.float32)
+        frames *= self.window
+
+        signal = self._overlap_add(frames)
+        window_sum = self._overlap_add(np.broadcast_to(self.window ** 2, frames.shape[-2:]))
+        signal /= np.maximum(window_sum, 1e-8)
+
+        pad = self.n_fft // 2
+        signal = signal[..., pad:]
+        if length is not None:
+            signal = signal[..., :length]
+            if signal.shape[-1] < length:
+                signal = np.pad(signal, [(0, 0)] * (signal.ndim - 1) + [(0, length - signal.shape[-1])])
+        else:
+            signal = signal[..., :signal.shape[-1] - pad]
+        return signal
+
+    def _overlap_add(self, frames: np.ndarray) -> np.ndarray:
+        """Overlap-add (..., frames, n_fft) with hop_length, one slice per hop-sized block"""
+        hop = self.hop_length
+        n_frames = frames.shape[-2]
+        blocks_per_frame = -(-self.n_fft // hop)
+
+        padded = np.zeros(frames.shape[:-1] + (blocks_per_frame * hop,), dtype=np.float32)
+        padded[..., :self.n_fft] = frames
+        blocks = padded.reshape(frames.shape[:-1] + (blocks_per_frame, hop))
+
+        output = np.zeros(frames.shape[:-2] + (n_frames + blocks_per_frame - 1, hop), dtype=np.float32)
+        for k in range(blocks_per_frame):
+            output[..., k:k + n_frames, :] += blocks[..., k, :]
+
+        total = self.n_fft + hop * (n_frames - 1) if n_frames else 0
+        return output.reshape(frames.shape[:-2] + (-1,))[..., :total]
+
+    def stream(self) -> "FeatureStream":
+        """Start incremental feature computation over a stream of blocks"""
+        return FeatureStream(self)
+
+    def _stft(self, audio: np.ndarray) -> np.ndarray:
+        if audio.shape[-1] < self.n_fft:
+            return np.zeros(audio.shape[:-1] + (self.n_fft // 2 + 1, 0), dtype=np.complex64)
+
+        frames = np.lib.stride_tricks.sliding_window_view(audio, self.n_fft, axis=-1)
+        frames = frames[..., ::self.hop_length, :]
+        spectrum = np.fft.rfft(frames * self.window, axis=-1)
+        return np.swapaxes(spectrum, -1, -2).astype(np.complex64, copy=False)
+
+    def _features(self, stft: np.ndarray) -> SpectralFeatures:
+        return SpectralFeatures(
+            stft=stft,
+            sample_rate=self.sample_rate,
+            n_fft=self.n_fft,
+            hop_length=self.hop_length,
+            n_mels=self.n_mels
+        )
+
+class FeatureStream:
+    """
+    Incremental centred STFT over consecutive audio blocks
+
+    Carries the samples not yet covered by a full frame between calls, so
+    feeding blocks one at a time and then calling flush() yields exactly
+    the frames compute() returns for the concatenated signal, without
+    recomputing any overlap.
+    """
+
+    def __init__(self, frontend: FeatureFrontend):
+        self.frontend = frontend
+        self._pad = frontend.n_fft // 2
+        self._carry = np.zeros(0, dtype=np.float32)
+        # Last samples of the signal, reflected at the end by flush()
+        self._tail = np.zeros(0, dtype=np.float32)
+        self._started = False
+        self.frames_emitted = 0
+
+    def push(self, block: np.ndarray) -> SpectralFeatures:
+        """Add a block and return features for the frames it completes"""
+        block = np.asarray(block, dtype=np.float32)
+        self._tail = np.concatenate([self._tail, block])[-(self._pad + 1):]
+        audio = np.concatenate([self._carry, block])
+
+        if not self._started:
+            if len(audio) <= self._pad:
+                # Not enough signal yet to reflect-pad the start like compute() does
+                self._carry = audio
+                return self._emit(self.frontend._stft(audio[:0]))
+            audio = np.concatenate([audio[self._pad:0:-1], audio])
+            self._started = True
+
+        stft = self.frontend._stft(audio)
+        self._carry = audio[stft.shape[-1] * self.frontend.hop_length:]
+        return self._emit(stft)
+
+    def flush(self) -> SpectralFeatures:
+        """Reflect-pad the end of the signal and emit the remaining frames"""
+        if not self._started:
+            # Signal no longer than half a window: compute() zero-pads it instead
+            features = self.frontend.compute(self._carry)
+            self._carry = np.zeros(0, dtype=np.float32)
+            self._tail = np.zeros(0, dtype=np.float32)
+            return self._emit(features.stft)
+
+        audio = np.concatenate([self._carry, self._tail[-2::-1]])
+        stft = self.frontend._stft(audio)
+        self._carry = np.zeros(0, dtype=np.float32)
+        self._tail = np.zeros(0, dtype=np.float32)
+        self._started = False
+        return self._emit(stft)
+
+    def _emit(self, stft: np.ndarray) -> SpectralFeatures:
+        self.frames_emitted += stft.shape[-1]
+        return self.frontend._features(stft)
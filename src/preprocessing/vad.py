@@ -0,0 +1,130 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import List, Optional
+
+from ..core.config import Config
+from .features import FeatureFrontend, SpectralFeatures
+
+@dataclass
+class Segment:
+    start: int  # samples
+    end: int  # samples, exclusive
+    is_speech: bool
+    continues: bool = False  # starts at a cut inside a longer speech run
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start
+
+class VoiceActivityDetector:
+    """
+    Energy-based voice activity detection and pause-aligned segmentation
+
+    Works on the frame energies of the shared feature frontend, one frame
+    per hop, so segment bounds fall on STFT frames.
+    """
+
+    def __init__(self, config: Config, frontend: Optional[FeatureFrontend] = None):
+        self.config = config
+        self.frontend = frontend or FeatureFrontend(config)
+        self.sample_rate = config.system.models.sample_rate
+        self.frame_length = self.frontend.hop_length
+        frame_duration = self.frame_length / self.sample_rate
+
+        self.threshold_db = config.system.processing.vad_threshold_db
+        self.floor_db = config.system.processing.vad_floor_db
+        self.min_silence_frames = int(config.system.processing.vad_min_silence / frame_duration)
+        self.min_speech_frames = int(config.system.processing.vad_min_speech / frame_duration)
+
+    def frame_energy_db(self, audio: np.ndarray, features: Optional[SpectralFeatures] = None) -> np.ndarray:
+        """Per-frame energy in dBFS, one value per hop_length samples of audio"""
+        if features is None:
+            features = self.frontend.compute(audio)
+        # Centred framing has one extra frame when the length is a multiple of the hop
+        n_frames = -(-len(audio) // self.frame_length)
+        return features.frame_dbfs[:n_frames]
+
+    def speech_mask(self, energy_db: np.ndarray) -> np.ndarray:
+        """Boolean speech mask per frame with short pauses and blips removed"""
+        if len(energy_db) == 0:
+            return np.zeros(0, dtype=bool)
+
+        # Speech must be near the loudest frame and above an absolute floor,
+        # so silent or noise-floor-only audio has no speech at all
+        mask = (energy_db > energy_db.max() + self.threshold_db) & (energy_db > self.floor_db)
+
+        # Pauses shorter than min_silence stay inside the speech region
+        starts, ends, values = self._runs(mask)
+        short_gaps = (~values) & (ends - starts < self.min_silence_frames) & (starts > 0) & (ends < len(mask))
+        for start, end in zip(starts[short_gaps], ends[short_gaps]):
+            mask[start:end] = True
+
+        # Isolated bursts shorter than min_speech are treated as silence
+        starts, ends, values = self._runs(mask)
+        short_bursts = values & (ends - starts < self.min_speech_frames)
+        for start, end in zip(starts[short_bursts], ends[short_bursts]):
+            mask[start:end] = False
+
+        return mask
+
+    def segment(
+        self,
+        audio: np.ndarray,
+        max_segment_duration: float,
+        features: Optional[SpectralFeatures] = None
+    ) -> List[Segment]:
+        """
+        Split audio into alternating speech and silence segments
+
+        Speech runs longer than max_segment_duration are cut at the
+        quietest frame in the second half of the window, so cuts land in
+        pauses rather than mid-word whenever the audio allows.
+
+        Args:
+            features: Frontend features of audio, if already computed
+        """
+        if len(audio) == 0:
+            return []
+
+        energy_db = self.frame_energy_db(audio, features)
+        mask = self.speech_mask(energy_db)
+        max_frames = max(1, int(max_segment_duration * self.sample_rate / self.frame_length))
+
+        segments = []
+        starts, ends, values = self._runs(mask)
+        for start, end, is_speech in zip(starts, ends, values):
+            if is_speech:
+                cuts = self._split_run(energy_db, start, end, max_frames)
+                for i, (cut_start, cut_end) in enumerate(cuts):
+                    segments.append(self._to_samples(cut_start, cut_end, True, len(audio), continues=i > 0))
+            else:
+                segments.append(self._to_samples(start, end, False, len(audio)))
+
+        return segments
+
+    def _split_run(self, energy_db: np.ndarray, start: int, end: int, max_frames: int) -> List[tuple]:
+        cuts = []
+        while end - start > max_frames:
+            window_start = start + max_frames // 2
+            window_end = start + max_frames
+            cut = window_start + int(np.argmin(energy_db[window_start:window_end]))
+            cuts.append((start, cut))
+            start = cut
+        cuts.append((start, end))
+        return cuts
+
+    def _to_samples(self, start: int, end: int, is_speech: bool, n_samples: int, continues: bool = False) -> Segment:
+        return Segment(
+            start=int(start * self.frame_length),
+            end=int(min(end * self.frame_length, n_samples)),
+            is_speech=bool(is_speech),
+            continues=continues
+        )
+
+    @staticmethod
+    def _runs(mask: np.ndarray):
+        """Run-length encode a boolean array into (starts, ends, values)"""
+        boundaries = np.flatnonzero(np.diff(mask.astype(np.int8))) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [len(mask)]))
+        return starts, ends, mask[starts]
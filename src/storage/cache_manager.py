@@ -1,7 +1,10 @@
+import os
 import pickle
 import hashlib
+import threading
+from contextlib import suppress
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 import numpy as np
 from datetime import datetime, timedelta
 
@@ -34,18 +37,23 @@ class CacheManager:
         """Get item from cache"""
         cache_file = self.cache_dir / f"{key}.cache"
         
-        if not cache_file.exists():
-            return None
-        
-        # Check if cache is expired
-        file_time = datetime.fromtimestamp(cache_file.stat().st_mtime)
-        if datetime.now() - file_time > self.cache_duration:
-            cache_file.unlink()
-            return None
-        
+        # Other processes share the cache directory and may evict the entry
+        # at any point, so a file that disappears is just a miss
         try:
+            # Check if cache is expired
+            file_time = datetime.fromtimestamp(cache_file.stat().st_mtime)
+            if datetime.now() - file_time > self.cache_duration:
+                cache_file.unlink(missing_ok=True)
+                return None
+            
             with open(cache_file, 'rb') as f:
-                return pickle.load(f)
+                data = pickle.load(f)
+            # Refresh mtime so size-based cleanup evicts least recently used entries
+            with suppress(FileNotFoundError):
+                os.utime(cache_file)
+            return data
+        except FileNotFoundError:
+            return None
         except Exception as e:
             logger.warning(f"Failed to load cache {key}: {e}")
             return None
@@ -54,9 +62,13 @@ class CacheManager:
         """Set item in cache"""
         cache_file = self.cache_dir / f"{key}.cache"
         
+        temp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        
         try:
-            with open(cache_file, 'wb') as f:
+            # Write then rename so concurrent readers never see a partial entry
+            with open(temp_file, 'wb') as f:
                 pickle.dump(data, f)
+            os.replace(temp_file, cache_file)
             
             # Clean cache if it's getting too large
             self._cleanup_cache()
@@ -74,19 +86,33 @@ class CacheManager:
         key = self._generate_cache_key(audio_path + str(Path(audio_path).stat().st_mtime))
         return self.get(f"speaker_emb_{key}")
     
+    def cache_conversion_result(self, key: str, result: Dict):
+        """Cache an encoded conversion output with its result metadata"""
+        self.set(f"conversion_{key}", result)
+    
+    def get_cached_conversion_result(self, key: str) -> Optional[Dict]:
+        """Get cached conversion output"""
+        return self.get(f"conversion_{key}")
+    
     def _cleanup_cache(self):
         """Remove old cache files if cache size exceeds limit"""
-        cache_files = list(self.cache_dir.glob("*.cache"))
-        total_size = sum(f.stat().st_size for f in cache_files)
+        entries = []
+        for cache_file in self.cache_dir.glob("*.cache"):
+            try:
+                entries.append((cache_file, cache_file.stat()))
+            except FileNotFoundError:
+                # Evicted by another process since the listing
+                continue
+        total_size = sum(stat.st_size for _, stat in entries)
         
         if total_size > self.max_cache_size:
             # Sort by modification time, oldest first
-            cache_files.sort(key=lambda x: x.stat().st_mtime)
+            entries.sort(key=lambda entry: entry[1].st_mtime)
             
             # Remove oldest files until under limit
-            for cache_file in cache_files:
-                cache_file.unlink()
-                total_size -= cache_file.stat().st_size
+            for cache_file, stat in entries:
+                cache_file.unlink(missing_ok=True)
+                total_size -= stat.st_size
                 logger.info(f"Removed old cache file: {cache_file.name}")
                 
                 if total_size <= self.max_cache_size * 0.8:  # Keep 20% buffer
@@ -95,5 +121,5 @@ class CacheManager:
     def clear_cache(self):
         """Clear all cache files"""
         for cache_file in self.cache_dir.glob("*.cache"):
-            cache_file.unlink()
+            cache_file.unlink(missing_ok=True)
         logger.info("Cache cleared")
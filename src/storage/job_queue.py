@@ -0,0 +1,276 @@
+import os
+import shutil
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..core.config import Config
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    source_path TEXT NOT NULL,
+    target_voice_id TEXT,
+    target_audio_path TEXT,
+    output_path TEXT NOT NULL,
+    chunks_done INTEGER NOT NULL DEFAULT 0,
+    chunks_total INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    duration REAL,
+    error TEXT,
+    worker_pid INTEGER,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at);
+"""
+
+class JobQueue:
+    """Persistent conversion job queue backed by SQLite.
+
+    Safe to share between the API process and worker processes: every
+    method opens its own connection and state transitions run inside
+    ``BEGIN IMMEDIATE`` transactions.
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.jobs_dir = Path(config.system.jobs.jobs_dir)
+        self.db_path = self.jobs_dir / "jobs.db"
+        self.max_attempts = config.system.jobs.max_attempts
+        self.lease_timeout = config.system.jobs.lease_timeout
+        self.retention = config.system.jobs.retention
+
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def job_dir(self, job_id: str) -> Path:
+        """Directory holding the inputs and output of a job"""
+        path = self.jobs_dir / job_id
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def remove_job_dir(self, job_id: str):
+        """Delete the inputs and output of a job"""
+        shutil.rmtree(self.jobs_dir / job_id, ignore_errors=True)
+
+    def new_job_id(self) -> str:
+        return uuid.uuid4().hex
+
+    def enqueue(
+        self,
+        job_id: str,
+        source_path: str,
+        target_voice_id: Optional[str] = None,
+        target_audio_path: Optional[str] = None
+    ) -> Dict:
+        """Add a job to the queue"""
+        now = time.time()
+        output_path = str(self.job_dir(job_id) / "output.wav")
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, source_path, target_voice_id, target_audio_path, "
+                "output_path, max_attempts, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, JOB_QUEUED, source_path, target_voice_id, target_audio_path,
+                 output_path, self.max_attempts, now, now)
+            )
+
+        logger.info(f"Enqueued job {job_id}")
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Get a job by ID"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 100) -> List[Dict]:
+        """List most recent jobs, optionally filtered by status"""
+        with self._connect() as conn:
+            if status:
+                rows = conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?",
+                    (status, limit)
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+                ).fetchall()
+        return [dict(row) for row in rows]
+
+    def claim(self, worker_pid: int) -> Optional[Dict]:
+        """Atomically take the oldest queued job and mark it running"""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                    (JOB_QUEUED,)
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, attempts = attempts + 1, worker_pid = ?, "
+                        "chunks_done = 0, updated_at = ? WHERE id = ?",
+                        (JOB_RUNNING, worker_pid, time.time(), row['id'])
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        if row is None:
+            return None
+
+        return self.get(row['id'])
+
+    # Updates made by a worker only apply while it still holds the job, so a
+    # worker whose lease expired cannot overwrite the job's next attempt
+    _HELD = "id = ? AND status = ? AND worker_pid = ?"
+
+    def update_progress(self, job_id: str, worker_pid: int, chunks_done: int, chunks_total: int) -> bool:
+        """Record per-chunk progress of a running job; also renews its lease"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"UPDATE jobs SET chunks_done = ?, chunks_total = ?, updated_at = ? WHERE {self._HELD}",
+                (chunks_done, chunks_total, time.time(), job_id, JOB_RUNNING, worker_pid)
+            )
+        return cursor.rowcount > 0
+
+    def heartbeat(self, job_id: str, worker_pid: int) -> bool:
+        """Renew the lease on a running job. Returns False if the lease was lost"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"UPDATE jobs SET updated_at = ? WHERE {self._HELD}",
+                (time.time(), job_id, JOB_RUNNING, worker_pid)
+            )
+        return cursor.rowcount > 0
+
+    def complete(self, job_id: str, worker_pid: int, duration: float):
+        """Mark a job as completed"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, duration = ?, error = NULL, worker_pid = NULL, "
+                f"updated_at = ? WHERE {self._HELD}",
+                (JOB_COMPLETED, duration, time.time(), job_id, JOB_RUNNING, worker_pid)
+            )
+        if cursor.rowcount:
+            logger.info(f"Job {job_id} completed")
+        else:
+            logger.warning(f"Worker {worker_pid} finished job {job_id} after losing its lease")
+
+    def fail(self, job_id: str, worker_pid: int, error: str):
+        """Record a failed attempt, requeueing the job while attempts remain"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts < max_attempts THEN ? ELSE ? END, "
+                f"error = ?, worker_pid = NULL, updated_at = ? WHERE {self._HELD}",
+                (JOB_QUEUED, JOB_FAILED, error, time.time(), job_id, JOB_RUNNING, worker_pid)
+            )
+        if not cursor.rowcount:
+            logger.warning(f"Worker {worker_pid} failed job {job_id} after losing its lease: {error}")
+            return
+
+        job = self.get(job_id)
+        if job and job['status'] == JOB_QUEUED:
+            logger.warning(f"Job {job_id} attempt {job['attempts']} failed, requeued: {error}")
+        else:
+            logger.error(f"Job {job_id} failed: {error}")
+
+    def requeue_stale(self) -> int:
+        """Recover running jobs whose worker died or whose lease expired
+
+        A recovered job counts as a failed attempt (claim() already
+        incremented ``attempts``), so a job that keeps killing its worker
+        ends up failed after ``max_attempts`` instead of looping forever.
+        Returns the number of jobs recovered.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT id, worker_pid, updated_at FROM jobs WHERE status = ?", (JOB_RUNNING,)
+                ).fetchall()
+                stale = [
+                    row for row in rows
+                    if not _pid_alive(row['worker_pid']) or now - row['updated_at'] > self.lease_timeout
+                ]
+                for row in stale:
+                    conn.execute(
+                        "UPDATE jobs SET status = CASE WHEN attempts < max_attempts THEN ? ELSE ? END, "
+                        "error = ?, worker_pid = NULL, updated_at = ? WHERE id = ?",
+                        (JOB_QUEUED, JOB_FAILED, f"Worker {row['worker_pid']} died or stopped responding",
+                         now, row['id'])
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        if stale:
+            logger.warning(f"Recovered {len(stale)} stale jobs: {', '.join(row['id'] for row in stale)}")
+        return len(stale)
+
+    def purge_expired(self) -> int:
+        """Delete finished jobs older than the retention period, with their files
+
+        Returns the number of jobs purged.
+        """
+        cutoff = time.time() - self.retention
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT id FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                    (JOB_COMPLETED, JOB_FAILED, cutoff)
+                ).fetchall()
+                conn.executemany("DELETE FROM jobs WHERE id = ?", [(row['id'],) for row in rows])
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        # Files go after the rows, so a job is never listed without its output
+        for row in rows:
+            self.remove_job_dir(row['id'])
+
+        if rows:
+            logger.info(f"Purged {len(rows)} expired jobs")
+        return len(rows)
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
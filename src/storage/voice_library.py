@@ -1,85 +1,363 @@
 import json
-import pickle
+import os
+import sqlite3
+import sys
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, List, Optional
 import numpy as np
 
 from ..core.config import Config
+from ..core.exceptions import VoiceConversionError
 from ..core.logger import get_logger
 
 logger = get_logger(__name__)
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS voices (
+    voice_id TEXT PRIMARY KEY,
+    slot INTEGER NOT NULL UNIQUE,
+    metadata TEXT NOT NULL,
+    name_key TEXT,
+    gender TEXT,
+    age_range TEXT,
+    accent TEXT,
+    generation INTEGER
+);
+CREATE TABLE IF NOT EXISTS free_slots (
+    slot INTEGER PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS library_info (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Secondary indexes for list filtering; created after column migration
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_voices_name_key ON voices (name_key);
+CREATE INDEX IF NOT EXISTS idx_voices_gender ON voices (gender, voice_id);
+CREATE INDEX IF NOT EXISTS idx_voices_age_range ON voices (age_range, voice_id);
+CREATE INDEX IF NOT EXISTS idx_voices_accent ON voices (accent, voice_id);
+"""
+
+_FILTER_COLUMNS = ('gender', 'age_range', 'accent')
+
 class VoiceLibrary:
+    """
+    Voice embeddings and metadata
+
+    Embeddings live in a single float32 matrix file that is memory-mapped
+    for reads; each voice owns one row ("slot"). The voice index, metadata
+    and free-slot list live in SQLite, so every add/remove is a single
+    transaction and concurrent processes can read while one writes.
+    Filterable metadata fields are mirrored into indexed columns, and a
+    version counter is bumped on every change for listing cache validation.
+
+    Freed slots are reused, so each voice row also records the library
+    version that wrote it (its generation). Readers re-check the voice's
+    slot and generation after copying the embedding and retry if it
+    changed, so they never return a row that was reassigned mid-read.
+    """
+
+    MIN_CAPACITY = 1024
+    MAX_READ_ATTEMPTS = 5
+
     def __init__(self, config: Config):
         self.config = config
         self.library_path = Path(config.system.voice_library_dir)
-        self.metadata_file = self.library_path / "metadata.json"
-        self.embeddings_dir = self.library_path / "embeddings"
-        
+        self.db_path = self.library_path / "index.db"
+        self.embeddings_file = self.library_path / "embeddings.f32"
+
+        self._matrix = None
+        self._matrix_rows = 0
+
         self._ensure_directories()
-        self.metadata = self._load_metadata()
-    
+        self._init_db()
+        self._migrate_legacy_library()
+
     def _ensure_directories(self):
         """Create necessary directories"""
         self.library_path.mkdir(parents=True, exist_ok=True)
-        self.embeddings_dir.mkdir(parents=True, exist_ok=True)
-    
-    def _load_metadata(self) -> Dict:
-        """Load voice library metadata"""
-        if self.metadata_file.exists():
-            with open(self.metadata_file, 'r') as f:
-                return json.load(f)
-        return {}
-    
-    def _save_metadata(self):
-        """Save voice library metadata"""
-        with open(self.metadata_file, 'w') as f:
-            json.dump(self.metadata, f, indent=2)
-    
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _write_transaction(self):
+        """
+        Exclusive write transaction; serializes writers across processes
+
+        The library version is bumped only if the transaction changed a row,
+        so no-op writes do not invalidate cached listings.
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            changes = conn.total_changes
+            try:
+                yield conn
+                if conn.total_changes != changes:
+                    self._set_info(conn, 'version', (self._get_info(conn, 'version') or 0) + 1)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._migrate_index_columns(conn)
+            conn.executescript(_INDEXES)
+
+    def _migrate_index_columns(self, conn):
+        """Add and backfill indexed columns on libraries created without them"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(voices)")}
+        if 'generation' not in columns:
+            # Rows written before generations existed keep NULL until replaced
+            conn.execute("ALTER TABLE voices ADD COLUMN generation INTEGER")
+        if 'name_key' in columns:
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for column in ('name_key',) + _FILTER_COLUMNS:
+                conn.execute(f"ALTER TABLE voices ADD COLUMN {column} TEXT")
+            rows = conn.execute("SELECT voice_id, metadata FROM voices").fetchall()
+            for voice_id, metadata in rows:
+                conn.execute(
+                    "UPDATE voices SET name_key = ?, gender = ?, age_range = ?, accent = ? "
+                    "WHERE voice_id = ?",
+                    (*self._index_values(json.loads(metadata)), voice_id)
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _index_values(metadata: Dict) -> tuple:
+        display_name = metadata.get('display_name')
+        return (
+            display_name.lower() if display_name else None,
+            *(metadata.get(column) for column in _FILTER_COLUMNS)
+        )
+
+    def _get_info(self, conn, key: str) -> Optional[int]:
+        row = conn.execute("SELECT value FROM library_info WHERE key = ?", (key,)).fetchone()
+        return int(row[0]) if row else None
+
+    def _set_info(self, conn, key: str, value: int):
+        conn.execute(
+            "INSERT OR REPLACE INTO library_info (key, value) VALUES (?, ?)", (key, str(value))
+        )
+
+    def _embedding_dim(self, conn) -> Optional[int]:
+        return self._get_info(conn, 'embedding_dim')
+
+    def _allocate_slot(self, conn, dim: int) -> int:
+        """Take a free slot or append one, growing the matrix file if needed"""
+        row = conn.execute("SELECT slot FROM free_slots ORDER BY slot LIMIT 1").fetchone()
+        if row is not None:
+            conn.execute("DELETE FROM free_slots WHERE slot = ?", (row[0],))
+            return row[0]
+
+        slot = self._get_info(conn, 'next_slot') or 0
+        capacity = self._get_info(conn, 'capacity') or 0
+        if slot >= capacity:
+            capacity = max(self.MIN_CAPACITY, capacity * 2)
+            with open(self.embeddings_file, 'ab') as f:
+                f.truncate(capacity * dim * np.dtype(np.float32).itemsize)
+            self._set_info(conn, 'capacity', capacity)
+
+        self._set_info(conn, 'next_slot', slot + 1)
+        return slot
+
+    def _write_row(self, slot: int, dim: int, embedding: np.ndarray):
+        offset = slot * dim * np.dtype(np.float32).itemsize
+        row = np.memmap(self.embeddings_file, dtype=np.float32, mode='r+', offset=offset, shape=(dim,))
+        row[:] = embedding
+        row.flush()
+        del row
+
+    def _read_row(self, slot: int, dim: int) -> np.ndarray:
+        if self._matrix is None or slot >= self._matrix_rows:
+            # Remap after another writer has grown the file
+            rows = os.path.getsize(self.embeddings_file) // (dim * np.dtype(np.float32).itemsize)
+            self._matrix = np.memmap(self.embeddings_file, dtype=np.float32, mode='r', shape=(rows, dim))
+            self._matrix_rows = rows
+        return np.array(self._matrix[slot])
+
+    def _migrate_legacy_library(self):
+        """Import a library written as metadata.json plus one .npy per voice"""
+        legacy_metadata = self.library_path / "metadata.json"
+        if not legacy_metadata.exists():
+            return
+
+        with open(legacy_metadata, 'r') as f:
+            metadata = json.load(f)
+
+        for voice_id, data in metadata.items():
+            embedding = np.load(data['embedding_path'])
+            self.add_voice(voice_id, embedding, {k: v for k, v in data.items() if k != 'embedding_path'})
+
+        legacy_metadata.rename(legacy_metadata.with_suffix(".json.migrated"))
+        logger.info(f"Migrated {len(metadata)} voices from legacy library format")
+
     def add_voice(
-        self, 
-        voice_id: str, 
-        embedding: np.ndarray, 
+        self,
+        voice_id: str,
+        embedding: np.ndarray,
         metadata: Dict
     ):
-        """Add a voice to the library"""
-        embedding_path = self.embeddings_dir / f"{voice_id}.npy"
-        np.save(embedding_path, embedding)
-        
-        self.metadata[voice_id] = {
-            'embedding_path': str(embedding_path),
-            **metadata
-        }
-        
-        self._save_metadata()
+        """Add a voice to the library, replacing any voice with the same ID"""
+        embedding = np.asarray(embedding, dtype=np.float32).ravel()
+
+        with self._write_transaction() as conn:
+            dim = self._embedding_dim(conn)
+            if dim is None:
+                dim = len(embedding)
+                self._set_info(conn, 'embedding_dim', dim)
+            elif len(embedding) != dim:
+                raise ValueError(f"Embedding dimension {len(embedding)} does not match library ({dim})")
+
+            # Always write to a fresh slot so a crash never leaves a half-written live row
+            slot = self._allocate_slot(conn, dim)
+            self._write_row(slot, dim, embedding)
+
+            old = conn.execute("SELECT slot FROM voices WHERE voice_id = ?", (voice_id,)).fetchone()
+            if old is not None:
+                conn.execute("DELETE FROM voices WHERE voice_id = ?", (voice_id,))
+                conn.execute("INSERT INTO free_slots (slot) VALUES (?)", (old[0],))
+
+            # The version this transaction commits; unique per write
+            generation = (self._get_info(conn, 'version') or 0) + 1
+            conn.execute(
+                "INSERT INTO voices (voice_id, slot, metadata, name_key, gender, age_range, accent, generation) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (voice_id, slot, json.dumps(metadata), *self._index_values(metadata), generation)
+            )
+
         logger.info(f"Added voice {voice_id} to library")
-    
+
     def get_voice_embedding(self, voice_id: str) -> np.ndarray:
         """Get voice embedding by ID"""
-        if voice_id not in self.metadata:
-            raise ValueError(f"Voice ID {voice_id} not found in library")
-        
-        embedding_path = self.metadata[voice_id]['embedding_path']
-        return np.load(embedding_path)
-    
-    def list_voices(self) -> List[Dict]:
-        """List all available voices"""
-        voices = []
-        for voice_id, data in self.metadata.items():
-            voice_info = {
-                'id': voice_id,
-                **{k: v for k, v in data.items() if k != 'embedding_path'}
-            }
-            voices.append(voice_info)
-        return voices
-    
+        query = "SELECT slot, generation FROM voices WHERE voice_id = ?"
+        with self._connect() as conn:
+            dim = self._embedding_dim(conn)
+            location = conn.execute(query, (voice_id,)).fetchone()
+
+            for _ in range(self.MAX_READ_ATTEMPTS):
+                if location is None:
+                    raise ValueError(f"Voice ID {voice_id} not found in library")
+
+                embedding = self._read_row(location[0], dim)
+
+                # A slot is only rewritten after its voice is removed or replaced,
+                # so an unchanged slot and generation means the copy is that voice's
+                current = conn.execute(query, (voice_id,)).fetchone()
+                if current == location:
+                    return embedding
+                location = current
+
+        raise VoiceConversionError(f"Voice {voice_id} kept changing while being read")
+
+    def _filter_clause(self, filters: Dict[str, Optional[str]], name_prefix: Optional[str]) -> tuple:
+        conditions = []
+        params = []
+        for column in _FILTER_COLUMNS:
+            if filters.get(column) is not None:
+                conditions.append(f"{column} = ?")
+                params.append(filters[column])
+
+        if name_prefix:
+            # Range scan on the lowercased name index (LIKE cannot use it)
+            prefix = name_prefix.lower()
+            conditions.append("name_key >= ?")
+            params.append(prefix)
+            upper = _prefix_upper_bound(prefix)
+            if upper is not None:
+                conditions.append("name_key < ?")
+                params.append(upper)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+    def list_voices(
+        self,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        gender: Optional[str] = None,
+        age_range: Optional[str] = None,
+        accent: Optional[str] = None,
+        name_prefix: Optional[str] = None,
+        after: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        List voices ordered by ID, optionally filtered and paginated
+
+        Pass the last ID of the previous page as ``after`` to page by key;
+        unlike ``offset``, its cost does not grow with the page depth.
+        """
+        where, params = self._filter_clause(
+            {'gender': gender, 'age_range': age_range, 'accent': accent}, name_prefix
+        )
+        if after is not None:
+            where = f"{where} AND voice_id > ?" if where else "WHERE voice_id > ?"
+            params.append(after)
+
+        query = f"SELECT voice_id, metadata FROM voices {where} ORDER BY voice_id LIMIT ? OFFSET ?"
+        params.extend([limit if limit is not None else -1, offset])
+
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        return [{'id': voice_id, **json.loads(metadata)} for voice_id, metadata in rows]
+
+    def count_voices(
+        self,
+        gender: Optional[str] = None,
+        age_range: Optional[str] = None,
+        accent: Optional[str] = None,
+        name_prefix: Optional[str] = None
+    ) -> int:
+        """Count voices matching the given filters"""
+        where, params = self._filter_clause(
+            {'gender': gender, 'age_range': age_range, 'accent': accent}, name_prefix
+        )
+        with self._connect() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM voices {where}", params).fetchone()[0]
+
+    def version(self) -> int:
+        """Library version, incremented by every add or remove that changes the library"""
+        with self._connect() as conn:
+            return self._get_info(conn, 'version') or 0
+
     def remove_voice(self, voice_id: str):
         """Remove a voice from the library"""
-        if voice_id in self.metadata:
-            embedding_path = Path(self.metadata[voice_id]['embedding_path'])
-            if embedding_path.exists():
-                embedding_path.unlink()
-            
-            del self.metadata[voice_id]
-            self._save_metadata()
-            logger.info(f"Removed voice {voice_id} from library")
+        with self._write_transaction() as conn:
+            row = conn.execute("SELECT slot FROM voices WHERE voice_id = ?", (voice_id,)).fetchone()
+            if row is None:
+                return
+
+            conn.execute("DELETE FROM voices WHERE voice_id = ?", (voice_id,))
+            conn.execute("INSERT INTO free_slots (slot) VALUES (?)", (row[0],))
+
+        logger.info(f"Removed voice {voice_id} from library")
+
+def _prefix_upper_bound(prefix: str) -> Optional[str]:
+    """Smallest string greater than every string starting with prefix, or None if unbounded"""
+    prefix = prefix.rstrip(chr(sys.maxunicode))
+    if not prefix:
+        return None
+
+    code_point = ord(prefix[-1]) + 1
+    if 0xD800 <= code_point <= 0xDFFF:
+        # Surrogates cannot be stored as UTF-8 text; skip to the next scalar value
+        code_point = 0xE000
+    return prefix[:-1] + chr(code_point)
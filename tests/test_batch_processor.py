@@ -0,0 +1,95 @@
+import json
+import os
+
+import pytest
+import soundfile as sf
+
+from src.pipeline.batch_processor import BatchItem, BatchManifest, BatchProcessor, discover_items
+
+def touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"")
+    return path
+
+def test_directory_outputs_mirror_relative_paths(tmp_path):
+    touch(tmp_path / "in" / "a" / "clip.wav")
+    touch(tmp_path / "in" / "b" / "clip.flac")
+    touch(tmp_path / "in" / "notes.txt")
+
+    items = discover_items(str(tmp_path / "in"), str(tmp_path / "out"))
+    assert sorted(item.output_path for item in items) == [
+        str(tmp_path / "out" / "a" / "clip.wav"),
+        str(tmp_path / "out" / "b" / "clip.wav"),
+    ]
+
+def test_same_stem_sources_get_distinct_outputs(tmp_path):
+    touch(tmp_path / "in" / "clip.wav")
+    touch(tmp_path / "in" / "clip.mp3")
+
+    outputs = [item.output_path for item in discover_items(str(tmp_path / "in"), str(tmp_path / "out"))]
+    assert len(set(outputs)) == 2
+    assert all(os.path.basename(output).startswith("clip-") for output in outputs)
+
+def test_manifest_defaults_and_explicit_outputs(tmp_path):
+    one, two = tmp_path / "clips" / "one.wav", tmp_path / "clips" / "two.wav"
+    manifest = tmp_path / "list.csv"
+    manifest.write_text(f"# source,output\n{one}\n{two},custom/two.wav\n\n")
+
+    items = discover_items(str(manifest), str(tmp_path / "out"))
+    assert items == [
+        BatchItem(str(one), str(tmp_path / "out" / "clips" / "one.wav")),
+        BatchItem(str(two), "custom/two.wav"),
+    ]
+
+def test_duplicate_outputs_are_rejected(tmp_path):
+    manifest = tmp_path / "list.csv"
+    manifest.write_text("one.wav,same.wav\ntwo.wav,same.wav\n")
+
+    with pytest.raises(ValueError, match="same output"):
+        discover_items(str(manifest), str(tmp_path / "out"))
+
+def test_manifest_resume_requires_output(tmp_path):
+    path = tmp_path / "manifest.jsonl"
+    done = BatchItem("a.wav", str(touch(tmp_path / "a.out.wav")))
+    missing = BatchItem("b.wav", str(tmp_path / "b.out.wav"))
+
+    manifest = BatchManifest(str(path))
+    manifest.mark_done(done, 1.0)
+    manifest.mark_done(missing, 1.0)
+    # A crash mid-write leaves a partial last line
+    with open(path, 'a') as f:
+        f.write('{"source_path": "c.wav", "outp')
+
+    reloaded = BatchManifest(str(path))
+    assert reloaded.is_done(done)
+    assert not reloaded.is_done(missing)
+    assert [json.loads(line)['source_path'] for line in path.read_text().splitlines()[:2]] == ["a.wav", "b.wav"]
+
+def test_batch_run_resumes(pipeline, write_audio, tmp_path):
+    for name in ("one.wav", "two.wav", "nested/three.wav"):
+        write_audio(f"in/{name}", 1.0)
+    touch(tmp_path / "in" / "broken.wav")
+
+    items = discover_items(str(tmp_path / "in"), str(tmp_path / "out"))
+    embedding = pipeline.speaker_encoder.extract_embedding(None)
+    processor = BatchProcessor(pipeline, decode_workers=2, inference_workers=1, write_workers=2, queue_size=2)
+
+    stats = processor.run(items, embedding, BatchManifest(str(tmp_path / "out" / "manifest.jsonl")))
+    assert (stats['completed'], stats['failed'], stats['skipped']) == (3, 1, 0)
+    assert sf.info(str(tmp_path / "out" / "nested" / "three.wav")).frames == 16000
+    assert not list((tmp_path / "out").rglob("*.partial"))
+
+    stats = processor.run(items, embedding, BatchManifest(str(tmp_path / "out" / "manifest.jsonl")))
+    assert (stats['completed'], stats['failed'], stats['skipped']) == (0, 1, 3)
+
+def test_cli_rejects_unknown_voice(pipeline, write_audio, tmp_path, monkeypatch):
+    from src import cli
+    from src.pipeline import conversion_pipeline
+    monkeypatch.setattr(conversion_pipeline, "VoiceConversionPipeline", lambda config_path: pipeline)
+    write_audio("in/one.wav", 1.0)
+
+    argv = ["--config", pipeline.config.config_path, "batch", str(tmp_path / "in"), str(tmp_path / "out")]
+    assert cli.main(argv + ["--voice-id", "missing"]) == 2
+
+    pipeline.voice_library.add_voice("known", pipeline.speaker_encoder.extract_embedding(None), {})
+    assert cli.main(argv + ["--voice-id", "known"]) == 0
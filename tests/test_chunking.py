@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+import soundfile as sf
+
+from src.pipeline.chunk_planner import MODE_OFFLINE, MODE_STREAMING, ChunkPlanner
+
+def test_offline_plan_splits_evenly(config):
+    planner = ChunkPlanner(config)
+    plan = planner.plan(95.0, MODE_OFFLINE)
+
+    step = plan.chunk_duration - plan.overlap_duration
+    n_chunks = -(-(95.0 - plan.overlap_duration) // step)
+    covered = n_chunks * step + plan.overlap_duration
+    assert covered >= 95.0
+    # An even split leaves at most rounding slack, never a short tail chunk
+    assert covered - 95.0 < n_chunks * 0.001 + 1e-9
+    assert plan.chunk_duration <= config.system.processing.max_chunk_duration
+
+def test_short_audio_is_one_chunk(config):
+    plan = ChunkPlanner(config).plan(4.0, MODE_OFFLINE)
+    assert plan.chunk_duration == 4.0
+    assert plan.overlap_duration == 0.0
+
+def test_streaming_chunk_fits_latency_target(config):
+    planner = ChunkPlanner(config)
+    planner.record(16000 * 10, 3.0)
+    plan = planner.plan(60.0, MODE_STREAMING)
+
+    assert plan.measured
+    assert plan.batch_size == 1
+    assert plan.chunk_duration * (1 + plan.real_time_factor) <= config.system.processing.latency_target + 1e-3
+
+def test_real_time_factor_is_kept_per_batch_size(config):
+    planner = ChunkPlanner(config)
+    batch_size = config.system.processing.batch_size
+    planner.record(16000 * 80, 8.0, batch_size)
+
+    # Batched offline timings do not leak into the streaming estimate
+    streaming = planner.plan(60.0, MODE_STREAMING)
+    assert not streaming.measured
+    assert streaming.real_time_factor == config.system.processing.initial_rtf
+
+    offline = planner.plan(60.0, MODE_OFFLINE)
+    assert offline.measured
+    assert offline.real_time_factor == pytest.approx(0.1)
+
+@pytest.mark.parametrize("audio_duration", [1 / 16000, 0.0004, 0.01])
+def test_tiny_audio_plans_at_least_one_hop(config, audio_duration):
+    plan = ChunkPlanner(config).plan(audio_duration, MODE_OFFLINE)
+    hop = config.system.models.hop_length / config.system.models.sample_rate
+    assert plan.chunk_duration >= hop
+    assert plan.overlap_duration == 0.0
+
+@pytest.mark.parametrize("vad_enabled", [False, True])
+def test_one_sample_file_converts(make_pipeline, tmp_path, vad_enabled):
+    pipeline = make_pipeline(processing={'vad_enabled': vad_enabled})
+    pipeline.voice_library.add_voice("voice", pipeline.speaker_encoder.extract_embedding(None), {})
+    source = tmp_path / "one.wav"
+    sf.write(str(source), np.array([0.5], dtype=np.float32), 16000)
+
+    result = pipeline.convert_voice(str(source), "voice", output_path=str(tmp_path / "out.wav"))
+    assert result['success'], result.get('error')
+
+def test_unknown_mode(config):
+    with pytest.raises(ValueError):
+        ChunkPlanner(config).plan(10.0, "realtime")
+
+@pytest.mark.parametrize("n_samples", [16000, 16001, 39999, 40000, 123457])
+def test_chunk_audio_preserves_tail(model_libraries, config, n_samples):
+    from src.preprocessing.audio_processor import AudioProcessor
+
+    processor = AudioProcessor(config)
+    audio = np.arange(n_samples, dtype=np.float32)
+    chunks = processor.chunk_audio(audio, chunk_duration=1.0, overlap=0.25)
+
+    overlap = int(0.25 * processor.sample_rate)
+    assert chunks[0][0] == 0
+    assert chunks[-1][-1] == n_samples - 1
+    assert sum(len(chunk) for chunk in chunks) - overlap * (len(chunks) - 1) == n_samples
@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.core.dtypes import AUDIO_DTYPE, as_audio
+from src.preprocessing.features import FeatureFrontend
+
+def test_as_audio_avoids_copies():
+    audio = np.zeros(100, dtype=np.float32)
+    assert as_audio(audio) is audio
+
+    converted = as_audio(np.zeros(100, dtype=np.float64))
+    assert converted.dtype == AUDIO_DTYPE
+    assert as_audio(audio[::2]).flags.c_contiguous
+
+def test_frontend_stays_single_precision(config):
+    features = FeatureFrontend(config).compute(np.random.default_rng(0).standard_normal(16000).astype(np.float32))
+    assert features.stft.dtype == np.complex64
+    assert features.mel.dtype == np.float32
+    assert features.frame_dbfs.dtype == np.float32
+
+def test_preprocessing_stays_float32(model_libraries, config, write_audio):
+    from src.preprocessing.audio_processor import AudioProcessor
+    processor = AudioProcessor(config)
+    processor.reduce_noise = lambda audio: audio
+
+    audio = processor.load_audio(write_audio("source.wav", 1.0, sample_rate=44100))
+    assert audio.dtype == AUDIO_DTYPE
+    assert processor.normalize_audio(audio).dtype == AUDIO_DTYPE
+
+    audio, features = processor.preprocess_with_features(write_audio("source.wav", 1.0))
+    assert audio.dtype == AUDIO_DTYPE
+    assert features.stft.dtype == np.complex64
+
+def test_conversion_stays_float32(pipeline):
+    audio = np.random.default_rng(0).standard_normal(40000).astype(np.float32) * 0.1
+    converted, _ = pipeline.convert_audio(audio, np.ones(256, dtype=np.float32))
+    assert converted.dtype == AUDIO_DTYPE
+
+    chunks = [np.ones(1000, dtype=np.float32), np.ones(1000, dtype=np.float32)]
+    assert pipeline._combine_chunks(chunks, 200).dtype == AUDIO_DTYPE
+
+@pytest.fixture
+def content_encoder(model_libraries, config):
+    from src.models.content_encoder import ContentEncoder
+    # Skip loading the pretrained model; only the numeric helpers are exercised
+    encoder = ContentEncoder.__new__(ContentEncoder)
+    encoder.config = config
+    encoder.processor = SimpleNamespace(feature_extractor=SimpleNamespace(do_normalize=True))
+    return encoder
+
+def test_content_batch_is_float32_and_zero_padded(content_encoder, monkeypatch):
+    from src.models import content_encoder as module
+    content_encoder.device = module.torch.device('cpu')
+    from_numpy = module.torch.from_numpy
+    arrays = []
+
+    def spy(array):
+        arrays.append(array)
+        return from_numpy(array)
+
+    monkeypatch.setattr(module.torch, "from_numpy", spy)
+    chunks = [np.arange(100, dtype=np.float32), np.arange(60, dtype=np.float64)]
+    _, _, lengths = content_encoder._prepare_batch(chunks)
+
+    batch, mask = arrays
+    assert lengths == [100, 60]
+    assert batch.dtype == np.float32 and batch.shape == (2, 100)
+    assert np.all(batch[1, 60:] == 0) and np.all(mask[1, 60:] == 0) and np.all(mask[1, :60] == 1)
+    # Normalized over each chunk's real samples only
+    assert batch[1, :60].mean() == pytest.approx(0, abs=1e-5)
+    assert batch[1, :60].std() == pytest.approx(1, abs=1e-3)
+
+def test_inference_dtype_resolution(content_encoder):
+    from src.models import content_encoder as module
+    content_encoder.device = SimpleNamespace(type='cpu')
+
+    assert content_encoder._resolve_inference_dtype('float32') is module.torch.float32
+    assert content_encoder._resolve_inference_dtype('bfloat16') is module.torch.bfloat16
+    # CPU autocast has no useful float16 path, so it falls back to bfloat16
+    assert content_encoder._resolve_inference_dtype('float16') is module.torch.bfloat16
+
+    from src.core.exceptions import ModelLoadingError
+    with pytest.raises(ModelLoadingError):
+        content_encoder._resolve_inference_dtype('int8')
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from src.core.exceptions import ModelLoadingError
+from src.models.vocoder import GriffinLimVocoder, available_vocoders, create_vocoder
+from src.models.voice_converter import SpectralEnvelopeConverter, available_converters, create_converter
+from src.preprocessing.features import FeatureFrontend
+
+def test_engines_selected_from_config(config):
+    assert isinstance(create_converter(config), SpectralEnvelopeConverter)
+    assert isinstance(create_vocoder(config), GriffinLimVocoder)
+    assert "spectral_baseline" in available_converters()
+    assert "griffin_lim" in available_vocoders()
+
+@pytest.mark.parametrize("section, field, factory", [
+    ("models", "voice_converter_model", create_converter),
+    ("models", "vocoder_model", create_vocoder),
+])
+def test_unknown_engine(make_config, section, field, factory):
+    config = make_config(**{section: {field: "missing"}})
+    with pytest.raises(ModelLoadingError, match="missing"):
+        factory(config)
+
+def test_converter_batch_shapes(config):
+    converter = create_converter(config)
+    rng = np.random.default_rng(0)
+    mels = rng.random((3, config.system.models.n_mels, 40)).astype(np.float32)
+    embeddings = rng.standard_normal((3, 256)).astype(np.float32)
+
+    converted = converter.convert_batch(None, mels, embeddings)
+    assert converted.shape == mels.shape
+    assert converted.dtype == np.float32
+
+    # Each chunk is converted independently of the rest of the batch
+    np.testing.assert_allclose(converter.convert_batch(None, mels[1:2], embeddings[1:2]), converted[1:2])
+
+def test_converter_warp_is_stable_and_bounded(config):
+    converter = create_converter(config)
+    embeddings = np.random.default_rng(1).standard_normal((16, 256)).astype(np.float32)
+
+    ratios = converter.warp_ratios(embeddings)
+    np.testing.assert_array_equal(ratios, converter.warp_ratios(embeddings))
+    bound = 2.0 ** (converter.max_shift_semitones / 12.0)
+    assert np.all((ratios >= 1 / bound) & (ratios <= bound))
+
+def test_vocoder_batch_shapes(config):
+    vocoder = GriffinLimVocoder(config, n_iter=4)
+    frontend = FeatureFrontend(config)
+    t = np.arange(8000) / 16000
+    chunks = np.stack([np.sin(2 * np.pi * f * t) for f in (200, 300)]).astype(np.float32)
+
+    waveforms = vocoder.synthesize_batch(frontend.compute(chunks).mel, 8000)
+    assert waveforms.shape == (2, 8000)
+    assert waveforms.dtype == np.float32
+    assert np.all(np.isfinite(waveforms))
+
+def test_baseline_pipeline_never_loads_content_encoder(pipeline):
+    audio = np.random.default_rng(0).standard_normal(16000).astype(np.float32) * 0.1
+    converted, _ = pipeline.convert_audio(audio, np.ones(256, dtype=np.float32))
+
+    assert len(converted) == len(audio)
+    assert pipeline._content_encoder is None
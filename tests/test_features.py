@@ -0,0 +1,92 @@
+import librosa
+import numpy as np
+import pytest
+
+from src.preprocessing.features import FeatureFrontend
+
+@pytest.fixture
+def frontend(config):
+    return FeatureFrontend(config)
+
+@pytest.fixture
+def audio():
+    rng = np.random.default_rng(0)
+    t = np.arange(16000 * 2) / 16000
+    signal = 0.5 * np.sin(2 * np.pi * 220 * t) + 0.05 * rng.standard_normal(len(t))
+    return signal.astype(np.float32)
+
+def test_stft_matches_librosa(frontend, audio):
+    features = frontend.compute(audio)
+    expected = librosa.stft(
+        audio, n_fft=frontend.n_fft, hop_length=frontend.hop_length, window='hann', center=True, pad_mode='reflect'
+    )
+    assert features.stft.shape == expected.shape
+    np.testing.assert_allclose(features.magnitude, np.abs(expected), rtol=1e-3, atol=1e-3)
+
+def test_mel_matches_librosa(frontend, audio):
+    features = frontend.compute(audio)
+    expected = librosa.feature.melspectrogram(
+        y=audio, sr=frontend.sample_rate, n_fft=frontend.n_fft, hop_length=frontend.hop_length,
+        n_mels=frontend.n_mels, power=2.0, pad_mode='reflect'
+    )
+    np.testing.assert_allclose(features.mel, expected, rtol=1e-3, atol=1e-2)
+
+def test_batch_matches_single_chunks(frontend, audio):
+    chunks = audio[:16000 * 2 // 2 * 2].reshape(2, -1)
+    batch = frontend.compute(chunks)
+    for i, chunk in enumerate(chunks):
+        np.testing.assert_allclose(batch.stft[i], frontend.compute(chunk).stft, rtol=1e-5, atol=1e-5)
+
+def test_span_matches_recompute_on_interior_frames(frontend, audio):
+    hop = frontend.hop_length
+    start, end = 20 * hop, 20 * hop + 16000
+    span = frontend.compute(audio).span(start, end)
+    recomputed = frontend.compute(audio[start:end])
+
+    assert span.n_frames == recomputed.n_frames
+    # Only frames next to the span edges differ: they see real audio instead of reflect padding
+    edge = frontend.n_fft // hop
+    np.testing.assert_allclose(span.stft[:, edge:-edge], recomputed.stft[:, edge:-edge], rtol=1e-4, atol=1e-4)
+
+def test_span_rejects_unaligned_start(frontend, audio):
+    with pytest.raises(ValueError):
+        frontend.compute(audio).span(1, 16000)
+
+def test_istft_round_trip(frontend, audio):
+    features = frontend.compute(audio)
+    restored = frontend.istft(features.stft, length=len(audio))
+    np.testing.assert_allclose(restored, audio, atol=1e-4)
+
+def test_frame_dbfs_of_full_scale_sine(frontend):
+    t = np.arange(16000) / 16000
+    sine = np.sin(2 * np.pi * 1000 * t).astype(np.float32)
+    dbfs = frontend.compute(sine).frame_dbfs
+    # Mean square of a full-scale sine is 1/2, about -3 dBFS
+    np.testing.assert_allclose(dbfs[4:-4], 10 * np.log10(0.5), atol=0.1)
+
+def stream_stft(frontend, audio, block_sizes):
+    stream = frontend.stream()
+    parts, start = [], 0
+    for size in block_sizes:
+        parts.append(stream.push(audio[start:start + size]).stft)
+        start += size
+    parts.append(stream.push(audio[start:]).stft)
+    parts.append(stream.flush().stft)
+    return np.concatenate(parts, axis=-1), stream.frames_emitted
+
+@pytest.mark.parametrize("block_sizes", [[4000] * 7, [1] * 600, [100, 5000, 3, 1024, 256, 9000], []])
+def test_stream_matches_whole_signal(frontend, audio, block_sizes):
+    stft, frames_emitted = stream_stft(frontend, audio, block_sizes)
+    expected = frontend.compute(audio).stft
+
+    assert stft.shape == expected.shape
+    assert frames_emitted == expected.shape[-1]
+    np.testing.assert_allclose(stft, expected, rtol=1e-5, atol=1e-4)
+
+@pytest.mark.parametrize("n_samples", [0, 1, 511, 512, 513, 1023, 1024, 1025])
+def test_stream_matches_whole_signal_for_short_input(frontend, audio, n_samples):
+    stft, _ = stream_stft(frontend, audio[:n_samples], [100] * 12)
+    expected = frontend.compute(audio[:n_samples]).stft
+
+    assert stft.shape == expected.shape
+    np.testing.assert_allclose(stft, expected, rtol=1e-5, atol=1e-4)
@@ -0,0 +1,111 @@
+import os
+import time
+
+import pytest
+
+from src.storage.job_queue import JOB_COMPLETED, JOB_FAILED, JOB_QUEUED, JOB_RUNNING, JobQueue
+
+PID = os.getpid()
+
+@pytest.fixture
+def jobs(config):
+    return JobQueue(config)
+
+def enqueue(jobs):
+    job_id = jobs.new_job_id()
+    jobs.enqueue(job_id, "source.wav", target_voice_id="voice")
+    return job_id
+
+def test_claim_takes_oldest_queued_job(jobs):
+    first = enqueue(jobs)
+    second = enqueue(jobs)
+
+    job = jobs.claim(PID)
+    assert job['id'] == first
+    assert job['status'] == JOB_RUNNING
+    assert job['attempts'] == 1
+    assert job['worker_pid'] == PID
+    assert jobs.claim(PID)['id'] == second
+    assert jobs.claim(PID) is None
+
+def test_complete(jobs):
+    job_id = enqueue(jobs)
+    jobs.claim(PID)
+    assert jobs.update_progress(job_id, PID, 2, 4)
+    jobs.complete(job_id, PID, 12.5)
+
+    job = jobs.get(job_id)
+    assert job['status'] == JOB_COMPLETED
+    assert job['duration'] == 12.5
+    assert job['worker_pid'] is None
+
+def test_fail_requeues_until_attempts_run_out(jobs):
+    job_id = enqueue(jobs)
+    for attempt in range(1, jobs.max_attempts + 1):
+        assert jobs.claim(PID)['attempts'] == attempt
+        jobs.fail(job_id, PID, "boom")
+        expected = JOB_QUEUED if attempt < jobs.max_attempts else JOB_FAILED
+        assert jobs.get(job_id)['status'] == expected
+
+    assert jobs.get(job_id)['error'] == "boom"
+    assert jobs.claim(PID) is None
+
+def test_updates_from_another_worker_are_ignored(jobs):
+    job_id = enqueue(jobs)
+    jobs.claim(PID)
+    other = PID + 1
+
+    assert not jobs.heartbeat(job_id, other)
+    assert not jobs.update_progress(job_id, other, 1, 1)
+    jobs.complete(job_id, other, 1.0)
+    jobs.fail(job_id, other, "late")
+    assert jobs.get(job_id)['status'] == JOB_RUNNING
+
+def test_requeue_stale_recovers_dead_worker(jobs):
+    job_id = enqueue(jobs)
+    jobs.claim(PID)
+    with jobs._connect() as conn:
+        conn.execute("UPDATE jobs SET worker_pid = ? WHERE id = ?", (2 ** 22 + 1, job_id))
+
+    assert jobs.requeue_stale() == 1
+    job = jobs.get(job_id)
+    assert job['status'] == JOB_QUEUED
+    assert job['worker_pid'] is None
+
+def test_requeue_stale_recovers_expired_lease(jobs):
+    job_id = enqueue(jobs)
+    jobs.claim(PID)
+    assert jobs.requeue_stale() == 0
+
+    with jobs._connect() as conn:
+        conn.execute("UPDATE jobs SET updated_at = ? WHERE id = ?", (time.time() - jobs.lease_timeout - 1, job_id))
+    assert jobs.requeue_stale() == 1
+    assert jobs.get(job_id)['status'] == JOB_QUEUED
+
+    # The worker that lost the lease can no longer touch the job
+    assert not jobs.heartbeat(job_id, PID)
+
+def test_requeue_stale_honours_max_attempts(jobs):
+    job_id = enqueue(jobs)
+    for _ in range(jobs.max_attempts):
+        jobs.claim(PID)
+        with jobs._connect() as conn:
+            conn.execute("UPDATE jobs SET updated_at = 0 WHERE id = ?", (job_id,))
+        jobs.requeue_stale()
+    assert jobs.get(job_id)['status'] == JOB_FAILED
+
+def test_purge_expired_removes_finished_jobs_and_files(jobs):
+    finished, running = enqueue(jobs), enqueue(jobs)
+    jobs.claim(PID)
+    jobs.complete(finished, PID, 1.0)
+    jobs.claim(PID)
+    assert jobs.purge_expired() == 0
+
+    with jobs._connect() as conn:
+        conn.execute("UPDATE jobs SET updated_at = 0")
+    assert jobs.purge_expired() == 1
+
+    assert jobs.get(finished) is None
+    assert not (jobs.jobs_dir / finished).exists()
+    assert jobs.get(running)['status'] == JOB_RUNNING
+    assert (jobs.jobs_dir / running).exists()
@@ -0,0 +1,86 @@
+import math
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+# Blocks of about 2 s (two 1 s chunks), so a few seconds of audio spans several blocks
+LONG_AUDIO = {
+    'long_audio_threshold': 2.0,
+    'max_chunk_duration': 1.0,
+    'min_chunk_duration': 0.5,
+    'batch_size': 2,
+}
+
+@pytest.fixture
+def long_pipeline(make_pipeline):
+    def make(**processing):
+        pipeline = make_pipeline(processing={**LONG_AUDIO, **processing})
+        pipeline.voice_library.add_voice("voice", pipeline.speaker_encoder.extract_embedding(None), {})
+        return pipeline
+    return make
+
+@pytest.mark.parametrize("sample_rate, channels", [(16000, 1), (44100, 2)])
+def test_output_length_matches_source(long_pipeline, write_audio, tmp_path, sample_rate, channels):
+    pipeline = long_pipeline()
+    source = write_audio("source.wav", 7.3, sample_rate=sample_rate, channels=channels)
+    output = str(tmp_path / "out.wav")
+
+    result = pipeline.convert_voice(source, "voice", output_path=output)
+
+    assert result['success'], result.get('error')
+    expected = math.ceil(sf.info(source).frames * 16000 / sample_rate)
+    assert sf.info(output).frames == expected
+    assert result['duration'] == pytest.approx(expected / 16000)
+
+def test_block_seams_preserve_timing(long_pipeline, write_audio, tmp_path, monkeypatch):
+    pipeline = long_pipeline(vad_enabled=False)
+    # Identity conversion: any misaligned or dropped samples at block seams show up in the output
+    monkeypatch.setattr(
+        pipeline, "convert_audio",
+        lambda block, embedding, progress_callback=None, plan=None: (block.copy(), 1)
+    )
+    source = write_audio("source.wav", 7.3)
+    output = str(tmp_path / "out.wav")
+
+    pipeline.convert_voice(source, "voice", output_path=output)
+
+    audio, _ = sf.read(source, dtype='float32')
+    converted, _ = sf.read(output, dtype='float32')
+    np.testing.assert_allclose(converted, audio / np.abs(audio).max(), atol=2 / 32768)
+
+def test_progress_is_reported_per_chunk(long_pipeline, write_audio, tmp_path, monkeypatch):
+    pipeline = long_pipeline(vad_enabled=False)
+
+    def convert_audio(block, embedding, progress_callback=None, plan=None):
+        # Report each chunk of the block, as the pipeline does after each model call
+        for done in range(1, plan.batch_size + 1):
+            progress_callback(done, plan.batch_size)
+        return block.copy(), plan.batch_size
+
+    monkeypatch.setattr(pipeline, "convert_audio", convert_audio)
+    source = write_audio("source.wav", 7.3)
+    progress = []
+
+    pipeline.convert_voice(
+        source, "voice", output_path=str(tmp_path / "out.wav"),
+        progress_callback=lambda done, total: progress.append((done, total))
+    )
+
+    done = [d for d, _ in progress]
+    total = progress[0][1]
+    assert all(t == total for _, t in progress)
+    assert done == sorted(done)
+    assert set(done) == set(range(1, total + 1))
+
+def test_progress_reaches_total_with_real_conversion(long_pipeline, write_audio, tmp_path):
+    pipeline = long_pipeline()
+    progress = []
+
+    pipeline.convert_voice(
+        write_audio("source.wav", 7.3), "voice", output_path=str(tmp_path / "out.wav"),
+        progress_callback=lambda done, total: progress.append((done, total))
+    )
+
+    assert [d for d, _ in progress] == sorted(d for d, _ in progress)
+    assert progress[-1][0] == progress[-1][1]
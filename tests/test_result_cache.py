@@ -0,0 +1,140 @@
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.storage.cache_manager import CacheManager
+
+@pytest.fixture
+def cache(config):
+    return CacheManager(config)
+
+def evicted_on_stat(monkeypatch, name):
+    """Make the cache file with this name disappear right after its first stat(), as if evicted"""
+    stat = Path.stat
+
+    def racing_stat(path, *args, **kwargs):
+        result = stat(path, *args, **kwargs)
+        if path.name == name:
+            os.unlink(path)
+            monkeypatch.setattr(Path, "stat", stat)
+        return result
+
+    monkeypatch.setattr(Path, "stat", racing_stat)
+
+def test_round_trip_and_miss(cache):
+    assert cache.get("missing") is None
+    cache.set("key", {'audio': b"abc"})
+    assert cache.get("key") == {'audio': b"abc"}
+
+def test_expired_entry_is_removed(cache):
+    cache.set("key", 1)
+    path = cache.cache_dir / "key.cache"
+    os.utime(path, (0, 0))
+
+    assert cache.get("key") is None
+    assert not path.exists()
+
+def test_entry_evicted_during_read_is_a_miss(cache, monkeypatch):
+    cache.set("key", 1)
+    evicted_on_stat(monkeypatch, "key.cache")
+    assert cache.get("key") is None
+
+def test_expired_entry_evicted_during_read_is_a_miss(cache, monkeypatch):
+    cache.set("key", 1)
+    os.utime(cache.cache_dir / "key.cache", (0, 0))
+    evicted_on_stat(monkeypatch, "key.cache")
+    assert cache.get("key") is None
+
+def test_cleanup_tolerates_concurrent_eviction(config, monkeypatch):
+    cache = CacheManager(config)
+    cache.set("old", b"x" * 100)
+    cache.max_cache_size = 0
+    evicted_on_stat(monkeypatch, "old.cache")
+
+    cache.set("new", b"y" * 100)
+    assert not list(cache.cache_dir.glob("*.cache"))
+
+@pytest.fixture
+def voice_pipeline(pipeline):
+    pipeline.voice_library.add_voice("voice", pipeline.speaker_encoder.extract_embedding(None), {})
+    return pipeline
+
+def test_repeated_request_is_served_from_cache(voice_pipeline, write_audio, tmp_path):
+    source = write_audio("source.wav", 1.0)
+    first = voice_pipeline.convert_voice(source, "voice", output_path=str(tmp_path / "first.wav"))
+
+    progress = []
+    second = voice_pipeline.convert_voice(
+        source, "voice", output_path=str(tmp_path / "second.wav"),
+        progress_callback=lambda done, total: progress.append((done, total))
+    )
+
+    assert first['success'] and not first['cache_hit']
+    assert second['cache_hit']
+    assert second['chunks_processed'] == first['chunks_processed']
+    assert progress == [(first['chunks_processed'], first['chunks_processed'])]
+    assert (tmp_path / "second.wav").read_bytes() == (tmp_path / "first.wav").read_bytes()
+
+def test_different_voice_is_not_a_hit(voice_pipeline, write_audio, tmp_path):
+    source = write_audio("source.wav", 1.0)
+    voice_pipeline.voice_library.add_voice("other", -voice_pipeline.speaker_encoder.extract_embedding(None), {})
+
+    voice_pipeline.convert_voice(source, "voice", output_path=str(tmp_path / "a.wav"))
+    assert not voice_pipeline.convert_voice(source, "other", output_path=str(tmp_path / "b.wav"))['cache_hit']
+
+def run_concurrently(pipeline, source, tmp_path, monkeypatch):
+    """Start a leader whose conversion blocks until released, then an identical follower"""
+    run_conversion = pipeline._run_conversion
+    started, release = threading.Event(), threading.Event()
+    runs = []
+
+    def slow_conversion(*args, **kwargs):
+        runs.append(args)
+        started.set()
+        release.wait(10)
+        return run_conversion(*args, **kwargs)
+
+    monkeypatch.setattr(pipeline, "_run_conversion", slow_conversion)
+    results = {}
+
+    def convert(name):
+        results[name] = pipeline.convert_voice(source, "voice", output_path=str(tmp_path / f"{name}.wav"))
+
+    leader = threading.Thread(target=convert, args=("leader",))
+    leader.start()
+    started.wait(10)
+    follower = threading.Thread(target=convert, args=("follower",))
+    follower.start()
+    return results, runs, release, leader, follower
+
+def test_identical_concurrent_requests_share_one_conversion(voice_pipeline, write_audio, tmp_path, monkeypatch):
+    source = write_audio("source.wav", 1.0)
+    results, runs, release, leader, follower = run_concurrently(voice_pipeline, source, tmp_path, monkeypatch)
+
+    follower.join(0.5)
+    assert follower.is_alive()
+    release.set()
+    leader.join(10)
+    follower.join(10)
+
+    assert len(runs) == 1
+    assert not results['leader']['cache_hit']
+    assert results['follower']['cache_hit']
+
+def test_follower_stops_waiting_after_timeout(make_pipeline, write_audio, tmp_path, monkeypatch):
+    pipeline = make_pipeline(system={'coalesce_timeout': 0.2})
+    pipeline.voice_library.add_voice("voice", pipeline.speaker_encoder.extract_embedding(None), {})
+    source = write_audio("source.wav", 1.0)
+    results, runs, release, leader, follower = run_concurrently(pipeline, source, tmp_path, monkeypatch)
+
+    # The follower converts on its own while the leader is still stuck
+    while len(runs) < 2 and follower.is_alive():
+        follower.join(0.05)
+    release.set()
+    leader.join(10)
+    follower.join(10)
+
+    assert len(runs) == 2
+    assert results['leader']['success'] and results['follower']['success']
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from src.preprocessing.vad import VoiceActivityDetector
+
+SR = 16000
+
+def tone(seconds, amplitude=0.5):
+    t = np.arange(int(seconds * SR)) / SR
+    return (amplitude * np.sin(2 * np.pi * 200 * t)).astype(np.float32)
+
+def silence(seconds):
+    return np.zeros(int(seconds * SR), dtype=np.float32)
+
+def assert_tiles(segments, n_samples):
+    assert segments[0].start == 0
+    assert segments[-1].end == n_samples
+    for previous, current in zip(segments, segments[1:]):
+        assert previous.end == current.start
+
+def test_segments_reassemble_audio(config):
+    vad = VoiceActivityDetector(config)
+    audio = np.concatenate([silence(1.0), tone(2.0), silence(1.0), tone(1.5), silence(0.5)])
+    segments = vad.segment(audio, max_segment_duration=30.0)
+
+    assert_tiles(segments, len(audio))
+    assert np.array_equal(np.concatenate([audio[s.start:s.end] for s in segments]), audio)
+
+    speech = [s for s in segments if s.is_speech]
+    assert len(speech) == 2
+    # Centred frames see half a window either side, plus one frame of rounding
+    tolerance = vad.frontend.n_fft // 2 + vad.frame_length
+    assert abs(speech[0].start - 1.0 * SR) <= tolerance
+    assert abs(speech[0].end - 3.0 * SR) <= tolerance
+    assert abs(speech[1].start - 4.0 * SR) <= tolerance
+
+def test_long_speech_is_cut_and_marked_continuing(config):
+    vad = VoiceActivityDetector(config)
+    audio = tone(10.0)
+    segments = vad.segment(audio, max_segment_duration=3.0)
+
+    assert_tiles(segments, len(audio))
+    assert all(s.is_speech for s in segments)
+    assert all(s.length <= 3.0 * SR for s in segments)
+    assert not segments[0].continues
+    assert all(s.continues for s in segments[1:])
+
+def test_short_pause_stays_in_speech(config):
+    vad = VoiceActivityDetector(config)
+    audio = np.concatenate([tone(1.0), silence(0.1), tone(1.0)])
+    segments = vad.segment(audio, max_segment_duration=30.0)
+    assert [s.is_speech for s in segments] == [True]
+
+@pytest.mark.parametrize("amplitude", [0.0, 1e-4])
+def test_quiet_audio_has_no_speech(config, amplitude):
+    vad = VoiceActivityDetector(config)
+    audio = tone(2.0, amplitude)
+    assert not any(s.is_speech for s in vad.segment(audio, max_segment_duration=30.0))
+
+def test_one_energy_value_per_hop(config):
+    vad = VoiceActivityDetector(config)
+    for n_samples in (vad.frame_length * 10, vad.frame_length * 10 + 1):
+        assert len(vad.frame_energy_db(tone(n_samples / SR))) == -(-n_samples // vad.frame_length)
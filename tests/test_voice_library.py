@@ -0,0 +1,125 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.storage.voice_library import VoiceLibrary, _prefix_upper_bound
+
+def embedding(seed, dim=8):
+    return np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+
+@pytest.fixture
+def library(config):
+    return VoiceLibrary(config)
+
+def test_add_and_read_back(library):
+    library.add_voice("a", embedding(1), {'name': "Alice"})
+    np.testing.assert_array_equal(library.get_voice_embedding("a"), embedding(1))
+    assert library.list_voices() == [{'id': "a", 'name': "Alice"}]
+
+def test_removed_slot_is_reused(library):
+    library.add_voice("a", embedding(1), {})
+    library.add_voice("b", embedding(2), {})
+    library.remove_voice("a")
+    library.add_voice("c", embedding(3), {})
+
+    with library._connect() as conn:
+        slots = dict(conn.execute("SELECT voice_id, slot FROM voices").fetchall())
+        next_slot = library._get_info(conn, 'next_slot')
+    assert sorted(slots.values()) == [0, 1]
+    assert next_slot == 2
+    np.testing.assert_array_equal(library.get_voice_embedding("b"), embedding(2))
+    np.testing.assert_array_equal(library.get_voice_embedding("c"), embedding(3))
+
+def test_replace_keeps_one_row(library):
+    library.add_voice("a", embedding(1), {'name': "old"})
+    library.add_voice("a", embedding(2), {'name': "new"})
+
+    assert library.count_voices() == 1
+    assert library.list_voices()[0]['name'] == "new"
+    np.testing.assert_array_equal(library.get_voice_embedding("a"), embedding(2))
+
+def test_dimension_mismatch(library):
+    library.add_voice("a", embedding(1), {})
+    with pytest.raises(ValueError):
+        library.add_voice("b", embedding(2, dim=4), {})
+
+def test_missing_voice(library):
+    with pytest.raises(ValueError):
+        library.get_voice_embedding("missing")
+
+def test_legacy_library_is_migrated(config):
+    library_dir = config.system.voice_library_dir
+    legacy = {}
+    for i, voice_id in enumerate(["v1", "v2"]):
+        path = f"{library_dir}/{voice_id}.npy"
+        np.save(path, embedding(i))
+        legacy[voice_id] = {'embedding_path': path, 'name': voice_id.upper(), 'gender': "female"}
+    with open(f"{library_dir}/metadata.json", 'w') as f:
+        json.dump(legacy, f)
+
+    library = VoiceLibrary(config)
+
+    assert library.count_voices(gender="female") == 2
+    assert library.list_voices()[0] == {'id': "v1", 'name': "V1", 'gender': "female"}
+    np.testing.assert_array_equal(library.get_voice_embedding("v2"), embedding(1))
+    assert (library.library_path / "metadata.json.migrated").exists()
+
+    # Reopening does not import the voices again
+    assert VoiceLibrary(config).count_voices() == 2
+
+def test_read_retries_when_voice_is_replaced_mid_read(library, monkeypatch):
+    library.add_voice("a", embedding(1), {})
+    read_row = library._read_row
+    calls = []
+
+    def racing_read(slot, dim):
+        row = read_row(slot, dim)
+        if not calls:
+            # Another writer replaces the voice after the slot was looked up
+            library.add_voice("a", embedding(2), {})
+        calls.append(slot)
+        return row
+
+    monkeypatch.setattr(library, "_read_row", racing_read)
+    np.testing.assert_array_equal(library.get_voice_embedding("a"), embedding(2))
+    assert len(calls) == 2 and calls[0] != calls[1]
+
+def test_keyset_pagination(library):
+    for voice_id in ["d", "a", "c", "b", "e"]:
+        library.add_voice(voice_id, embedding(0), {})
+
+    pages, after = [], None
+    while True:
+        page = library.list_voices(limit=2, after=after)
+        if not page:
+            break
+        pages.append([voice['id'] for voice in page])
+        after = page[-1]['id']
+    assert pages == [["a", "b"], ["c", "d"], ["e"]]
+
+def test_name_prefix_filter(library):
+    for voice_id, name in [("1", "Anna"), ("2", "Annabel"), ("3", "Anne"), ("4", "Ann\uffffx"), ("5", "Bob")]:
+        library.add_voice(voice_id, embedding(0), {'display_name': name})
+    assert [v['display_name'] for v in library.list_voices(name_prefix="Ann")] == ["Anna", "Annabel", "Anne", "Ann\uffffx"]
+    assert library.count_voices(name_prefix="anna") == 2
+
+@pytest.mark.parametrize("prefix, expected", [
+    ("abc", "abd"),
+    ("a\uffff", "a\U00010000"),
+    ("a\U0010ffff", "b"),
+    ("\U0010ffff", None),
+    ("a\ud7ff", "a\ue000"),
+])
+def test_prefix_upper_bound(prefix, expected):
+    assert _prefix_upper_bound(prefix) == expected
+
+def test_version_changes_only_on_real_writes(library):
+    library.add_voice("a", embedding(1), {})
+    version = library.version()
+
+    library.remove_voice("missing")
+    assert library.version() == version
+
+    library.remove_voice("a")
+    assert library.version() == version + 1